@@ -5,21 +5,39 @@
 # - For formatted export (autofit + team color banding + multi-sheets), use the Excel download.
 
 import re
+import threading
 import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
 from io import BytesIO
 from urllib.parse import urljoin, urlparse
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import streamlit as st
 
+# C-backed HTML parsing when lxml is installed; html.parser keeps the app usable without it
+try:
+    from lxml import etree
+    HAS_LXML = True
+except Exception:
+    HAS_LXML = False
+_PARSER = "lxml" if HAS_LXML else "html.parser"
+
 # Optional Excel export (app still runs without it)
 try:
     from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, PatternFill
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, NamedStyle, PatternFill
     from openpyxl.utils import get_column_letter
-    from openpyxl.worksheet.table import Table, TableStyleInfo
+    from openpyxl.worksheet.filters import AutoFilter
+    from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
     HAS_OPENPYXL = True
 except Exception:
     HAS_OPENPYXL = False
@@ -40,8 +58,31 @@ CONTACT_PAGE_TEXT_PAT = re.compile(r"\b(contact|contactez-nous|nous joindre|comm
 EMAIL_RE = re.compile(r"[A-Z0-9._%+\-]+@[A-Z0-9.\-]+\.[A-Z]{2,}", re.I)
 PHONE_RE = re.compile(r"(\+?\d[\d\-\s().]{7,}\d)")
 POSTAL_CA_RE = re.compile(r"\b[ABCEGHJ-NPRSTVXY]\d[ABCEGHJ-NPRSTV-Z][ -]?\d[ABCEGHJ-NPRSTV-Z]\d\b", re.I)
-
-BANNED_WORDS = set("""
+# "has an email or a phone" in one scan instead of two
+CONTACT_RE = re.compile(EMAIL_RE.pattern + "|" + PHONE_RE.pattern, re.I)
+# trailing run of characters a PHONE_RE match can be made of
+_PHONE_RUN_END_RE = re.compile(r"[+\d\-\s().]+\Z")
+
+# Name / role helpers run on every candidate line of every page: compile once.
+_WS_RE = re.compile(r"\s+")
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+_PARENS_RE = re.compile(r"\([^)]*\)")
+_NON_NAME_CHARS_RE = re.compile(r"[^A-Za-zÀ-ÿ\-\s'\.]")
+_DIGIT_RE = re.compile(r"\d")
+_LEAD_LETTER_RE = re.compile(r"^[A-Za-zÀ-ÿ]")
+_ANY_LETTER_RE = re.compile(r"[A-Za-zÀ-ÿ]")
+_WORD_TOKEN_RE = re.compile(r"[A-Za-zÀ-ÿ']+")
+
+# Phone digits, TD "Part of" links, slugs and Excel names
+_NON_DIGITS_RE = re.compile(r"\D+")
+_PART_OF_RE = re.compile(r"^(Part of|Fait partie de)\b", re.I)
+_PART_OF_PREFIX_RE = re.compile(r"^(Part of|Fait partie de)\s*", re.I)
+_SLUG_BAD_RE = re.compile(r"[^A-Za-z0-9\-]+")
+_DASH_RUN_RE = re.compile(r"-{2,}")
+_SHEET_BAD_RE = re.compile(r"[\[\]\:\*\?\/\\]")
+_TABLE_NAME_BAD_RE = re.compile(r"[^A-Za-z0-9_]")
+
+BANNED_WORDS = frozenset("""
 contact communiquer communique contactez nous joindre
 approach commitment services service produits product planning planification patrimoine
 privabanque bio biographie team accueil home
@@ -50,42 +91,60 @@ successoraux fiduciaires fondée founded savoir plus visitez visit
 email call connect discovery process additional specialist specialists
 """.split())
 
-PARTICLES = set([
+PARTICLES = frozenset([
     "de", "du", "des", "la", "le", "da", "di", "del", "della", "van", "von", "der", "den",
     "st", "ste", "saint", "sainte", "mc", "mac", "o'"
 ])
 
-ROLE_WORDS = {
+ROLE_WORDS = frozenset({
     "senior", "branch", "administrator", "admin", "assistant", "associate", "advisor", "adviser",
     "manager", "director", "president", "vp", "vice", "consultant", "specialist", "partner",
     "investment", "portfolio", "financial", "wealth", "planner", "planning",
     "conseiller", "conseillère", "placement", "gestionnaire", "directeur", "président", "adjointe", "adjoint",
     "client", "service", "representative", "représentant", "représentante"
-}
+})
 
-JUNK_PHRASES = {
+JUNK_PHRASES = frozenset({
     "our branch team", "notre équipe de succursale", "our team", "notre équipe",
     "email us", "call us", "contact us", "let's connect", "lets connect",
     "additional td specialists", "a unique discovery process", "discovery process"
-}
+})
 
-TD_STOP_MARKERS = {"Additional TD Specialists", "Spécialistes TD additionnels", "Additional TD specialists"}
-TD_SOCIAL_MARKERS = {"social links", "liens sociaux"}
+TD_STOP_MARKERS = frozenset({"Additional TD Specialists", "Spécialistes TD additionnels", "Additional TD specialists"})
+TD_SOCIAL_MARKERS = frozenset({"social links", "liens sociaux"})
+# normalized (_norm_heading_text) section headings of a TD directory page
+TD_ADVISOR_HEADINGS = frozenset({"advisors", "advisor", "conseillers", "conseiller"})
+TD_TEAM_HEADINGS = frozenset({"teams", "team", "équipes", "equipes", "équipe", "equipe"})
 
 
 # =============================================================================
 # URL helpers
 # =============================================================================
 
+# urlparse is pure-Python string scanning and the same URLs are re-parsed by every
+# helper below (and across discovery/build passes), so results are memoized.
+@lru_cache(maxsize=4096)
+def _uparse(u: str):
+    return urlparse(u)
+
+@lru_cache(maxsize=4096)
+def _netloc(u: str) -> str:
+    return (_uparse(u).netloc or "").lower()
+
 def norm_url(u: str) -> str:
-    p = urlparse(u)
+    p = _uparse(u)
     return p._replace(fragment="", query="").geturl()
 
 def same_domain(a: str, b: str) -> bool:
-    return urlparse(a).netloc.lower() == urlparse(b).netloc.lower()
+    return _netloc(a) == _netloc(b)
+
+# One tree per fetched page. When a page is handed to more than one extractor (a TD root
+# that is also its own roster fallback, a Desjardins root that is also the team page), the
+# caller passes the soup it already has instead of parsing again.
+def parse_html(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, _PARSER)
 
-def extract_links(html: str, base_url: str):
-    soup = BeautifulSoup(html, "lxml")
+def extract_links(soup: BeautifulSoup, base_url: str):
     out = []
     for a in soup.find_all("a", href=True):
         href = (a.get("href") or "").strip()
@@ -96,15 +155,103 @@ def extract_links(html: str, base_url: str):
         out.append((text, abs_url))
     return out
 
-def page_title(html: str) -> str:
-    soup = BeautifulSoup(html, "lxml")
+class _LinkCollector:
+    """lxml parser target: keeps (href, text pieces) for anchors and drops everything else."""
+
+    # get_text() leaves these strings out, so anchor text must too
+    _SKIP_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+    def __init__(self):
+        self.links = []
+        self._href = None
+        self._pieces = []
+        self._buf = []
+        self._skip = 0
+
+    def _flush(self):
+        # same text runs BeautifulSoup would see as strings (split at every tag)
+        if self._buf:
+            s = "".join(self._buf).strip()
+            if s and self._href is not None:
+                self._pieces.append(s)
+            self._buf = []
+
+    def start(self, tag, attrs):
+        self._flush()
+        if tag in self._SKIP_TEXT_TAGS:
+            self._skip += 1
+        if tag == "a" and self._href is None and "href" in attrs:
+            self._href = attrs["href"]
+            self._pieces = []
+
+    def end(self, tag):
+        self._flush()
+        if tag in self._SKIP_TEXT_TAGS and self._skip:
+            self._skip -= 1
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, " ".join(self._pieces)))
+            self._href = None
+
+    def data(self, data):
+        if self._href is not None and not self._skip:
+            self._buf.append(data)
+
+    def close(self):
+        return self.links
+
+def collect_links(html: str, base_url: str):
+    """extract_links() for pages that are only scanned for links: no tree is built."""
+    if not HAS_LXML:
+        return extract_links(BeautifulSoup(html, _PARSER, parse_only=SoupStrainer("a", href=True)), base_url)
+    parser = etree.HTMLParser(target=_LinkCollector())
+    parser.feed(html or "")
+    out = []
+    for href, text in parser.close():
+        href = (href or "").strip()
+        if not href:
+            continue
+        out.append((text, norm_url(urljoin(base_url, href))))
+    return out
+
+def page_title(soup: BeautifulSoup) -> str:
     h1 = soup.find("h1")
-    if h1 and h1.get_text(strip=True):
-        return h1.get_text(" ", strip=True)
+    text = h1.get_text(" ", strip=True) if h1 else ""
+    if text:
+        return text
     if soup.title and soup.title.string:
         return soup.title.string.strip()
     return ""
 
+def text_and_lines(node):
+    """One walk over node's strings: (get_text(" ", strip=True), non-empty lines of get_text("\\n", strip=True))."""
+    pieces = list(node.stripped_strings)
+    lines = [x.strip() for p in pieces for x in p.split("\n") if x.strip()]
+    return " ".join(pieces), lines
+
+def _is_contact_href(href) -> bool:
+    return bool(href) and href.startswith(("mailto:", "tel:"))
+
+def _is_mailto_href(href) -> bool:
+    return bool(href) and href.startswith("mailto:")
+
+def has_contact_link(node) -> bool:
+    return node.find("a", href=_is_contact_href) is not None
+
+def contact_links(node):
+    """(emails, phones) from mailto:/tel: anchors under node, one walk, document order, not deduped."""
+    emails, phones = [], []
+    for a in node.find_all("a", href=_is_contact_href):
+        href = a["href"]
+        if href.startswith("mailto:"):
+            e = href[7:].split("?", 1)[0].strip()
+            if e:
+                emails.append(e)
+        else:
+            p = href[4:].strip()
+            if p:
+                phones.append(p)
+    return emails, phones
+
 def find_best_link(links, base_url: str, pattern: re.Pattern):
     candidates = []
     for text, url in links:
@@ -112,8 +259,10 @@ def find_best_link(links, base_url: str, pattern: re.Pattern):
             continue
         if pattern.search(text or "") or pattern.search(url or ""):
             candidates.append((text, url))
-    candidates.sort(key=lambda x: len(urlparse(x[1]).path))
-    return candidates[0][1] if candidates else ""
+    if not candidates:
+        return ""
+    # shortest path wins; min() keeps the first of equal paths, like the stable sort did
+    return min(candidates, key=lambda x: len(_uparse(x[1]).path))[1]
 
 
 # =============================================================================
@@ -121,13 +270,13 @@ def find_best_link(links, base_url: str, pattern: re.Pattern):
 # =============================================================================
 
 def is_td_url(u: str) -> bool:
-    return "advisors.td.com" in (urlparse(u).netloc or "").lower()
+    return "advisors.td.com" in _netloc(u)
 
 def is_desjardins_url(u: str) -> bool:
-    return "desjardins.com" in (urlparse(u).netloc or "").lower()
+    return "desjardins.com" in _netloc(u)
 
 def is_cibc_wg_url(u: str) -> bool:
-    return "woodgundyadvisors.cibc.com" in (urlparse(u).netloc or "").lower()
+    return "woodgundyadvisors.cibc.com" in _netloc(u)
 
 
 # =============================================================================
@@ -136,56 +285,150 @@ def is_cibc_wg_url(u: str) -> bool:
 
 SESSION = requests.Session()
 SESSION.headers.update(DEFAULT_HEADERS)
-_PAGE_CACHE = {}
-
-def polite_get(url: str, sleep_s: float = 0.75, timeout: int = 25, retries: int = 3):
-    """Polite GET with retry/backoff + safer decoding (accents) + cache."""
+# Keep-alive pool sized for the build worker threads (one pool per host, several
+# sockets each) so TLS handshakes are paid once per connection, not per page.
+# Transient failures (connection errors, 429/5xx) are retried by urllib3 with backoff;
+# a 404 on a guessed URL fails at once instead of being retried.
+_HTTP_RETRY = Retry(
+    total=2,
+    backoff_factor=1.25,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    raise_on_status=False,
+)
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_HTTP_RETRY)
+SESSION.mount("https://", _HTTP_ADAPTER)
+SESSION.mount("http://", _HTTP_ADAPTER)
+
+# Streamlit re-executes this script on every widget interaction, which used to reset
+# the page cache. Keep it (and its lock) as a process-wide resource so reruns and
+# repeated builds reuse pages fetched in the last PAGE_CACHE_TTL_S seconds.
+PAGE_CACHE_TTL_S = 24 * 3600
+PAGE_CACHE_MAX = 900
+
+# Evicts least-recently-used: hits move to the end, so directory roots and team pages
+# that are re-read keep their slot while one-shot profile pages age out.
+@st.cache_resource(show_spinner=False)
+def _shared_page_cache():
+    return OrderedDict(), threading.Lock()
+
+_PAGE_CACHE, _PAGE_CACHE_LOCK = _shared_page_cache()
+
+def _cache_lookup(ukey: str):
+    with _PAGE_CACHE_LOCK:
+        hit = _PAGE_CACHE.get(ukey)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[2] > PAGE_CACHE_TTL_S:
+            del _PAGE_CACHE[ukey]
+            return None
+        _PAGE_CACHE.move_to_end(ukey)
+    return hit[0], hit[1]
+
+def _cache_store(ukey: str, html: str, final_url: str):
+    with _PAGE_CACHE_LOCK:
+        _PAGE_CACHE[ukey] = (html, final_url, time.monotonic())
+        _PAGE_CACHE.move_to_end(ukey)
+        if len(_PAGE_CACHE) > PAGE_CACHE_MAX:
+            _PAGE_CACHE.popitem(last=False)
+
+# Per-host politeness: the build step fetches from worker threads, so the delay is
+# reserved per host (next free start time) instead of sleeping globally.
+_HOST_NEXT_SLOT = {}
+_HOST_SLOT_LOCK = threading.Lock()
+
+def _polite_wait(url: str, sleep_s: float):
+    host = _netloc(url)
+    delay = max(0.0, sleep_s)
+    with _HOST_SLOT_LOCK:
+        now = time.monotonic()
+        start = max(now + delay, _HOST_NEXT_SLOT.get(host, 0.0))
+        _HOST_NEXT_SLOT[host] = start + delay
+    time.sleep(max(0.0, start - now))
+
+# Spacing alone still lets slow responses pile up on one host (8 workers, 3 s pages), so
+# requests also hold one of HOST_MAX_IN_FLIGHT per-host slots while they are on the wire.
+# The slot is taken before _polite_wait: a start time reserved while both slots were busy
+# would otherwise go out the moment one frees, right behind another queued request.
+HOST_MAX_IN_FLIGHT = 2
+_HOST_SEMAPHORES = {}
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    host = _netloc(url)
+    with _HOST_SLOT_LOCK:
+        sem = _HOST_SEMAPHORES.get(host)
+        if sem is None:
+            sem = _HOST_SEMAPHORES[host] = threading.BoundedSemaphore(HOST_MAX_IN_FLIGHT)
+    return sem
+
+def polite_get(url: str, sleep_s: float = 0.75, timeout: int = 25):
+    """Polite GET with retry/backoff (via the session adapter) + safer decoding (accents) + cache. Thread-safe."""
     ukey = norm_url(url)
-    if ukey in _PAGE_CACHE:
-        return _PAGE_CACHE[ukey]
+    hit = _cache_lookup(ukey)
+    if hit is not None:
+        return hit
 
-    time.sleep(max(0.0, sleep_s))
-    last_err = None
-    for attempt in range(retries):
-        try:
-            r = SESSION.get(url, timeout=timeout, allow_redirects=True)
-            r.raise_for_status()
+    with _host_slot(url):
+        _polite_wait(url, sleep_s)
+        r = SESSION.get(url, timeout=timeout, allow_redirects=True)
+    r.raise_for_status()
 
-            enc = (r.encoding or "").lower()
-            if not enc or enc == "iso-8859-1":
-                r.encoding = r.apparent_encoding or "utf-8"
+    enc = (r.encoding or "").lower()
+    if not enc or enc == "iso-8859-1":
+        r.encoding = r.apparent_encoding or "utf-8"
 
-            html = r.text
-            final_url = r.url
+    html = r.text
+    final_url = r.url
 
-            _PAGE_CACHE[ukey] = (html, final_url)
-            if len(_PAGE_CACHE) > 900:
-                _PAGE_CACHE.pop(next(iter(_PAGE_CACHE)))
+    _cache_store(ukey, html, final_url)
 
-            return html, final_url
-        except Exception as e:
-            last_err = e
-            time.sleep(1.25 * (attempt + 1))
-    raise last_err
+    return html, final_url
+
+def polite_head(url: str, sleep_s: float = 0.75, timeout: int = 10) -> str:
+    """Existence probe for guessed URLs: HEAD (no body). Returns the final URL, or "" on a miss."""
+    hit = _cache_lookup(norm_url(url))
+    if hit is not None:
+        return hit[1]
+
+    try:
+        with _host_slot(url):
+            _polite_wait(url, sleep_s)
+            r = SESSION.head(url, timeout=timeout, allow_redirects=True)
+    except Exception:
+        return ""
+    if r.status_code in (405, 501):
+        # server does not support HEAD: fall back to a (cached) GET. That is a second request
+        # to the host, so it takes its own spaced slot.
+        try:
+            return polite_get(url, sleep_s=sleep_s)[1]
+        except Exception:
+            return ""
+    return r.url if r.status_code < 400 else ""
 
 
 # =============================================================================
 # Name / Role helpers
 # =============================================================================
 
+# Pure string -> str/bool helpers. The same short lines come back many times (every roster
+# buffer, every role probe, post-processing), so results are memoized.
+NAME_CACHE_SIZE = 65536
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def clean_person_name(raw: str) -> str:
     s = str(raw or "")
     s = s.replace("\u00A0", " ").replace("’", "'")
-    s = re.sub(r"\([^)]*\)", "", s).strip()
+    s = _PARENS_RE.sub("", s).strip()
     if "," in s:
         s = s.split(",", 1)[0].strip()
-    s = re.sub(r"[^A-Za-zÀ-ÿ\-\s'\.]", "", s)
-    s = re.sub(r"\s{2,}", " ", s).strip(" -–—|")
+    s = _NON_NAME_CHARS_RE.sub("", s)
+    s = _MULTI_SPACE_RE.sub(" ", s).strip(" -–—|")
     return s
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def is_valid_person_name(raw: str) -> bool:
     s = clean_person_name(raw)
-    if not s or re.search(r"\d", s):
+    if not s or _DIGIT_RE.search(s):
         return False
     if s.lower().strip() in JUNK_PHRASES:
         return False
@@ -195,42 +438,52 @@ def is_valid_person_name(raw: str) -> bool:
         return False
 
     low_tokens = [t.lower().strip(".") for t in tokens]
-    if any(t in BANNED_WORDS for t in low_tokens):
+    if not BANNED_WORDS.isdisjoint(low_tokens):
         return False
 
+    # every non-particle token must start with [A-ZÀ-Ý] (plain code point range check)
     caps = 0
-    for t in tokens:
-        tl = t.lower().strip(".")
+    for t, tl in zip(tokens, low_tokens):
         if tl in PARTICLES:
             continue
-        if re.match(r"^[A-ZÀ-Ý]", t):
-            caps += 1
-        else:
+        c = t[0]
+        if not ("A" <= c <= "Z" or "À" <= c <= "Ý"):
             return False
+        caps += 1
     return caps >= 2
 
-def canon_name(raw: str) -> str:
-    return re.sub(r"[^a-z]+", "", clean_person_name(raw).lower())
+# Canonical keys keep only ASCII a-z: drop non-ASCII on encode, then delete the rest with a byte table.
+_NON_AZ_BYTES = bytes(c for c in range(128) if not (97 <= c <= 122))
 
 def _canon(s: str) -> str:
-    return re.sub(r"[^a-z]+", "", (s or "").lower())
+    return (s or "").lower().encode("ascii", "ignore").translate(None, _NON_AZ_BYTES).decode("ascii")
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def canon_name(raw: str) -> str:
+    return _canon(clean_person_name(raw))
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def is_likely_role(text: str, person_name: str = "") -> bool:
     if not text:
         return False
-    t = re.sub(r"\s+", " ", text).strip(" -|•·")
+    t = _WS_RE.sub(" ", text).strip(" -|•·")
     if len(t) < 2 or len(t) > 120:
         return False
     tl = t.lower()
     if tl in JUNK_PHRASES:
         return False
-    if EMAIL_RE.search(t) or PHONE_RE.search(t):
+    if CONTACT_RE.search(t):
         return False
     if person_name and _canon(t) == _canon(person_name):
         return False
 
-    toks = re.findall(r"[A-Za-zÀ-ÿ']+", tl)
-    return any(tok in ROLE_WORDS for tok in toks)
+    toks = _WORD_TOKEN_RE.findall(tl)
+    return not ROLE_WORDS.isdisjoint(toks)
+
+def find_emails(text: str) -> list:
+    """EMAIL_RE.findall, skipped when there is no "@": on text without one the pattern still
+    backtracks through every run of address characters before failing."""
+    return EMAIL_RE.findall(text) if "@" in text else []
 
 def _first_email(email_field: str) -> str:
     s = (email_field or "").strip()
@@ -242,13 +495,20 @@ def _digits_phone(phone_field: str) -> str:
     s = (phone_field or "").strip()
     if not s:
         return ""
-    return re.sub(r"\D+", "", s)[:15]
+    return _NON_DIGITS_RE.sub("", s)[:15]
+
+def _unique_by(items, key):
+    """First item per key, in input order (dict keeps insertion order)."""
+    first = {}
+    for x in items:
+        first.setdefault(key(x), x)
+    return list(first.values())
 
 def _normalize_phone_list(phone_candidates):
     by_digits = {}
     for p in phone_candidates:
-        s = re.sub(r"\s+", " ", (p or "")).strip()
-        digs = re.sub(r"\D+", "", s)
+        s = _WS_RE.sub(" ", (p or "")).strip()
+        digs = _NON_DIGITS_RE.sub("", s)
         if len(digs) < 10:
             continue
         score = 0
@@ -268,137 +528,157 @@ def _normalize_phone_list(phone_candidates):
 # TD logic (Directory -> Advisors + Teams)
 # =============================================================================
 
+# Every TD link on a directory page goes through both helpers, and roots repeat across
+# the heading and fallback scans: memoized by URL string like _uparse.
+@lru_cache(maxsize=4096)
 def td_root_from_any_td_url(u: str) -> str:
-    p = urlparse(u)
-    parts = [x for x in p.path.split("/") if x]
-    if not parts:
+    p = _uparse(u)
+    slug = next((x for x in p.path.split("/") if x), "")
+    if not slug:
         return f"{p.scheme}://{p.netloc}/"
-    slug = parts[0]
     return f"{p.scheme}://{p.netloc}/{slug}/"
 
+@lru_cache(maxsize=4096)
 def _td_is_one_segment_root(u: str) -> bool:
-    p = urlparse(u)
+    p = _uparse(u)
     parts = [x for x in p.path.strip("/").split("/") if x]
     return len(parts) == 1
 
+@lru_cache(maxsize=4096)
+def td_link_root(u: str) -> str:
+    """TD one-segment root for a link, or "" when the link is not under a TD root.
+    The per-link filter of the directory scans, in one memoized call."""
+    if "advisors.td.com" not in u.lower() or not is_td_url(u):
+        return ""
+    root = td_root_from_any_td_url(u)
+    return root if _td_is_one_segment_root(root) else ""
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def _norm_heading_text(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").replace("\u00A0", " ")).strip().lower()
+    return _WS_RE.sub(" ", (s or "").replace("\u00A0", " ")).strip().lower()
+
+def td_page_headings(soup: BeautifulSoup):
+    """(tag, normalized text) for every h2-h4, collected once per directory page."""
+    return [(h, _norm_heading_text(h.get_text(" ", strip=True))) for h in soup.find_all(["h2", "h3", "h4"])]
 
-def td_is_directory_page(soup: BeautifulSoup) -> bool:
-    headings = {_norm_heading_text(h.get_text(" ", strip=True)) for h in soup.find_all(["h2", "h3", "h4"])}
-    has_advisors = any(x in headings for x in {"advisors", "advisor", "conseillers", "conseiller"})
-    has_teams = any(x in headings for x in {"teams", "team", "équipes", "equipes", "équipe", "equipe"})
-    return has_advisors and has_teams
+def td_is_directory_page(headings: list) -> bool:
+    texts = {ht for _, ht in headings}
+    return not texts.isdisjoint(TD_ADVISOR_HEADINGS) and not texts.isdisjoint(TD_TEAM_HEADINGS)
 
-def td_extract_links_under_heading(soup: BeautifulSoup, base_url: str, heading_set: set):
+def td_extract_links_under_heading(headings: list, base_url: str, heading_set: set):
     """Collect TD roots under heading block (works for common directory layouts)."""
-    for h in soup.find_all(["h2", "h3", "h4"]):
-        ht = _norm_heading_text(h.get_text(" ", strip=True))
+    for h, ht in headings:
         if ht not in heading_set:
             continue
 
-        links = []
         # Prefer "section container": the closest parent that contains many links
         container = h
         for _ in range(6):
             if container.parent is None:
                 break
             container = container.parent
-            a_count = len(container.find_all("a", href=True))
-            if a_count >= 3:
+            # only "at least 3" matters: stop the subtree walk at the third anchor
+            if len(container.find_all("a", href=True, limit=3)) >= 3:
                 break
 
-        for a in container.find_all("a", href=True):
-            t = a.get_text(" ", strip=True)
-            u = norm_url(urljoin(base_url, a.get("href")))
-            links.append((t, u))
+        anchors = container.find_all("a", href=True)
 
-        # fallback: scan after heading
-        if not links:
-            for sib in h.find_next_siblings():
-                if getattr(sib, "name", None) in ["h2", "h3", "h4"]:
+        # fallback: scan after heading (lazy sibling walk, stops at the next heading)
+        if not anchors:
+            for sib in h.next_siblings:
+                if not isinstance(sib, Tag):
+                    continue
+                if sib.name in ("h2", "h3", "h4"):
                     break
-                for a in sib.find_all("a", href=True):
-                    t = a.get_text(" ", strip=True)
-                    u = norm_url(urljoin(base_url, a.get("href")))
-                    links.append((t, u))
-
-        out, seen = [], set()
-        for t, u in links:
-            if not is_td_url(u):
-                continue
-            root = td_root_from_any_td_url(u)
-            if not _td_is_one_segment_root(root):
-                continue
-            k = root.lower()
-            if k in seen:
-                continue
-            seen.add(k)
-            out.append((t, root))
-        return out
+                anchors.extend(sib.find_all("a", href=True))
+
+        # resolve the root first: link text is only extracted for anchors that are TD roots
+        out = []
+        for a in anchors:
+            root = td_link_root(norm_url(urljoin(base_url, a.get("href"))))
+            if root:
+                out.append((a.get_text(" ", strip=True), root))
+        return _unique_by(out, lambda x: x[1].lower())
     return []
 
-def td_scan_all_one_segment_roots(html: str, base_url: str):
+def td_scan_all_one_segment_roots(soup: BeautifulSoup, base_url: str):
     """Hard fallback: find all TD one-segment roots on the page."""
-    links = extract_links(html, base_url)
-    roots, seen = [], set()
+    links = extract_links(soup, base_url)
+    roots = []
 
-    branch_slug = (urlparse(base_url).path.strip("/").split("/")[0].lower()
-                   if urlparse(base_url).path.strip("/") else "")
+    branch_slug = (_uparse(base_url).path.strip("/").split("/")[0].lower()
+                   if _uparse(base_url).path.strip("/") else "")
 
     for text, u in links:
-        if not is_td_url(u):
-            continue
-        root = td_root_from_any_td_url(u)
-        if not _td_is_one_segment_root(root):
+        root = td_link_root(u)
+        if not root:
             continue
-        seg = urlparse(root).path.strip("/").lower()
+        seg = _uparse(root).path.strip("/").lower()
         if not seg or seg == branch_slug:
             continue
-        k = root.lower()
-        if k in seen:
-            continue
-        seen.add(k)
         roots.append((text or root, root))
-    return roots
+    return _unique_by(roots, lambda x: x[1].lower())
 
-def td_detect_single_root_kind(html: str) -> str:
-    """Advisor profiles usually contain 'Part of / Fait partie de' link."""
-    soup = BeautifulSoup(html, "lxml")
+def td_find_part_of_team(soup: BeautifulSoup, base_url: str):
+    """One anchor scan for the 'Part of / Fait partie de' link.
+    Returns (is_advisor, team_name, team_root): advisor profiles carry such a link; the team
+    comes from the first one that points back into TD."""
+    is_advisor = False
     for a in soup.find_all("a", href=True):
         t = a.get_text(" ", strip=True)
-        if re.match(r"^(Part of|Fait partie de)\b", t, re.I):
-            return "advisor"
-    return "team"
-
-def td_extract_part_of_team(html: str, base_url: str):
-    soup = BeautifulSoup(html, "lxml")
-    for a in soup.find_all("a", href=True):
-        t = a.get_text(" ", strip=True)
-        if re.match(r"^(Part of|Fait partie de)\b", t, re.I):
-            team_name = re.sub(r"^(Part of|Fait partie de)\s*", "", t, flags=re.I).strip()
-            team_url = norm_url(urljoin(base_url, a.get("href")))
-            if is_td_url(team_url):
-                return team_name, td_root_from_any_td_url(team_url)
-    return "", ""
+        if not _PART_OF_RE.match(t):
+            continue
+        is_advisor = True
+        team_url = norm_url(urljoin(base_url, a.get("href")))
+        if is_td_url(team_url):
+            return True, _PART_OF_PREFIX_RE.sub("", t).strip(), td_root_from_any_td_url(team_url)
+    return is_advisor, "", ""
+
+# root -> resolved roster URL. Kept across reruns with the page cache's TTL and LRU cap, so a
+# roster that moves is re-probed within PAGE_CACHE_TTL_S; only hits are stored, so a root that
+# failed on a network error is probed again next time.
+@st.cache_resource(show_spinner=False)
+def _shared_meet_url_cache():
+    return OrderedDict(), threading.Lock()
+
+_TD_MEET_URLS, _TD_MEET_URLS_LOCK = _shared_meet_url_cache()
+
+def _meet_url_lookup(base: str) -> str:
+    with _TD_MEET_URLS_LOCK:
+        hit = _TD_MEET_URLS.get(base)
+        if hit is None:
+            return ""
+        if time.monotonic() - hit[1] > PAGE_CACHE_TTL_S:
+            del _TD_MEET_URLS[base]
+            return ""
+        _TD_MEET_URLS.move_to_end(base)
+    return hit[0]
+
+def _meet_url_store(base: str, url: str):
+    with _TD_MEET_URLS_LOCK:
+        _TD_MEET_URLS[base] = (url, time.monotonic())
+        _TD_MEET_URLS.move_to_end(base)
+        if len(_TD_MEET_URLS) > PAGE_CACHE_MAX:
+            _TD_MEET_URLS.popitem(last=False)
 
 def td_guess_meet_the_team_url(root_final: str, sleep_s: float):
+    base = root_final.rstrip("/") + "/"
+    known = _meet_url_lookup(base)
+    if known:
+        return known
+
     guesses = [
         "meet-the-team.htm", "meet-the-team.html", "meet-the-team",
         "meet-the-advisors.htm", "meet-the-advisors.html"
     ]
-    base = root_final.rstrip("/") + "/"
     for g in guesses:
-        u = urljoin(base, g)
-        try:
-            _, final_u = polite_get(u, sleep_s=sleep_s)
+        final_u = polite_head(urljoin(base, g), sleep_s=sleep_s)
+        if final_u:
+            _meet_url_store(base, final_u)
             return final_u
-        except Exception:
-            continue
     return ""
 
-def td_extract_person_from_profile(html: str, base_url: str):
-    soup = BeautifulSoup(html, "lxml")
+def td_extract_person_from_profile(soup: BeautifulSoup, base_url: str):
     h1 = soup.find("h1")
     if not h1:
         return None
@@ -407,7 +687,7 @@ def td_extract_person_from_profile(html: str, base_url: str):
     if not is_valid_person_name(name):
         return None
 
-    lines = [x.strip() for x in soup.get_text("\n", strip=True).split("\n") if x.strip()]
+    text, lines = text_and_lines(soup)
     role_lines = []
     try:
         idx = next(i for i, x in enumerate(lines) if clean_person_name(x) == name)
@@ -423,41 +703,23 @@ def td_extract_person_from_profile(html: str, base_url: str):
             role_lines.append(line)
     role = " / ".join(dict.fromkeys(role_lines))[:120]
 
-    emails = []
-    for a in soup.select('a[href^="mailto:"]'):
-        href = a.get("href", "")
-        e = href.split("mailto:", 1)[-1].split("?", 1)[0].strip()
-        if e and e not in emails:
-            emails.append(e)
-    if not emails:
-        for m in EMAIL_RE.findall(soup.get_text(" ", strip=True)):
-            if m not in emails:
-                emails.append(m)
-
-    phones = []
-    for a in soup.select('a[href^="tel:"]'):
-        href = a.get("href", "")
-        p = href.split("tel:", 1)[-1].strip()
-        if p and p not in phones:
-            phones.append(p)
-    if not phones:
-        for m in PHONE_RE.findall(soup.get_text(" ", strip=True)):
-            phones.append(m)
-    phones = _normalize_phone_list(phones)
+    # dicts as ordered sets: dedupe without rescanning a list per value
+    link_emails, link_phones = contact_links(soup)
+    emails = list(dict.fromkeys(link_emails)) or list(dict.fromkeys(find_emails(text)))
+    phones = _normalize_phone_list(list(dict.fromkeys(link_phones)) or PHONE_RE.findall(text))
 
     address = ""
-    text_lines = [x.strip() for x in soup.get_text("\n", strip=True).split("\n") if x.strip()]
-    for i, line in enumerate(text_lines):
+    for i, line in enumerate(lines):
         if line.lower() in {"office location", "adresse du bureau"}:
-            if i + 1 < len(text_lines):
-                address = text_lines[i + 1]
+            if i + 1 < len(lines):
+                address = lines[i + 1]
             break
     if not address:
-        for i, line in enumerate(text_lines):
+        for i, line in enumerate(lines):
             if POSTAL_CA_RE.search(line):
                 start = max(0, i - 2)
-                end = min(len(text_lines), i + 2)
-                address = " | ".join(text_lines[start:end])
+                end = min(len(lines), i + 2)
+                address = " | ".join(lines[start:end])
                 break
 
     return {
@@ -470,147 +732,143 @@ def td_extract_person_from_profile(html: str, base_url: str):
         "source": "td_profile",
     }
 
-def td_extract_people_from_meet_page(html: str):
-    """Parse TD roster page (best-effort) using stripped strings."""
-    soup = BeautifulSoup(html, "lxml")
-    strings = [s.strip().replace("\u00A0", " ") for s in soup.stripped_strings if s and s.strip()]
+def _td_roster_person(buf: list):
+    """One roster entry (its lines, in page order) -> person dict, or None without a valid name."""
+    # cleaned once per line; both the name and the role pass compare against it
+    cleaned = [clean_person_name(x) for x in buf]
+    name = next((nm for nm in cleaned if is_valid_person_name(nm)), "")
+    if not name:
+        return None
 
-    trimmed = []
-    for s in strings:
-        if s in TD_STOP_MARKERS:
+    # each line is scanned for emails/phones once; a line "has contact" (CONTACT_RE) exactly
+    # when either list is non-empty, so the role pass reuses these instead of searching again
+    line_emails = [find_emails(x) for x in buf]
+    line_phones = [PHONE_RE.findall(x) for x in buf]
+    emails = list(dict.fromkeys(m for ms in line_emails for m in ms))
+    phones = _normalize_phone_list([m for ms in line_phones for m in ms])
+
+    role_lines, hit_name = [], False
+    for x, nm, em, ph in zip(buf, cleaned, line_emails, line_phones):
+        if nm == name:
+            hit_name = True
+            continue
+        if not hit_name:
+            continue
+        if em or ph:
             break
-        trimmed.append(s)
+        if is_likely_role(x, name):
+            role_lines.append(x)
+    role = " / ".join(dict.fromkeys(role_lines))[:120]
 
-    entries, cur = [], []
+    return {
+        "advisor_name": name,
+        "advisor_role": role,
+        "advisor_email": "; ".join(emails[:3]),
+        "advisor_phone": "; ".join(phones[:3]),
+        "advisor_address": "",
+        "advisor_profile_url": "",
+        "source": "td_meet_the_team",
+    }
 
-    def has_any_contact(buf):
-        txt = " ".join(buf)
-        return bool(EMAIL_RE.search(txt) or PHONE_RE.search(txt))
+def td_extract_people_from_meet_page(soup: BeautifulSoup):
+    """Parse TD roster page (best-effort) using stripped strings."""
+    people, cur = {}, []
+    # Does " ".join(cur) contain an email/phone? Tracked as lines are added instead of re-joining
+    # the buffer: a new match must end in the new line, and can only start inside the trailing run
+    # of phone characters (cur_tail) before it, so only cur_tail + the new line is searched.
+    cur_has_contact, cur_tail = False, ""
 
     def looks_like_person_line(x: str) -> bool:
         nm = clean_person_name(x)
         return is_valid_person_name(nm) and (nm.lower() not in JUNK_PHRASES)
 
-    for s in trimmed:
-        if s.strip().lower() in TD_SOCIAL_MARKERS:
+    def close_entry(buf):
+        # deduped as entries close: the first entry per (first email or canonical name) wins
+        p = _td_roster_person(buf)
+        if p:
+            people.setdefault(_first_email(p["advisor_email"]) or canon_name(p["advisor_name"]), p)
+
+    # one lazy pass over the strings: the tree walk stops at the "Additional TD Specialists" marker,
+    # and each entry is turned into a person as soon as the next boundary closes it
+    for raw in soup.stripped_strings:
+        s = raw.replace("\u00A0", " ")
+        if s in TD_STOP_MARKERS:
+            break
+        sl = s.lower()
+        if sl in TD_SOCIAL_MARKERS:
             if cur:
-                entries.append(cur)
-            cur = []
+                close_entry(cur)
+            cur, cur_has_contact, cur_tail = [], False, ""
             continue
-        if s.lower() == "photo":
-            continue
-        if cur and has_any_contact(cur) and looks_like_person_line(s):
-            entries.append(cur)
-            cur = [s]
+        if sl == "photo":
             continue
+        if cur_has_contact and looks_like_person_line(s):
+            close_entry(cur)
+            cur, cur_has_contact, cur_tail = [], False, ""
+        if not cur_has_contact:
+            probe = f"{cur_tail} {s}" if cur else s
+            cur_has_contact = bool(CONTACT_RE.search(probe))
+            m = _PHONE_RUN_END_RE.search(probe)
+            cur_tail = m.group() if m else ""
         cur.append(s)
     if cur:
-        entries.append(cur)
-
-    people = []
-    for buf in entries:
-        name = ""
-        for x in buf:
-            nm = clean_person_name(x)
-            if is_valid_person_name(nm):
-                name = nm
-                break
-        if not name:
-            continue
+        close_entry(cur)
 
-        emails = []
-        for x in buf:
-            for m in EMAIL_RE.findall(x):
-                if m not in emails:
-                    emails.append(m)
+    return list(people.values())
 
-        phone_candidates = []
-        for x in buf:
-            for m in PHONE_RE.findall(x):
-                phone_candidates.append(m)
-        phones = _normalize_phone_list(phone_candidates)
-
-        role_lines, hit_name = [], False
-        for x in buf:
-            if clean_person_name(x) == name:
-                hit_name = True
-                continue
-            if not hit_name:
-                continue
-            if EMAIL_RE.search(x) or PHONE_RE.search(x):
-                break
-            if is_likely_role(x, name):
-                role_lines.append(x)
-        role = " / ".join(dict.fromkeys(role_lines))[:120]
-
-        people.append({
-            "advisor_name": name,
-            "advisor_role": role,
-            "advisor_email": "; ".join(emails[:3]),
-            "advisor_phone": "; ".join(phones[:3]),
-            "advisor_address": "",
-            "advisor_profile_url": "",
-            "source": "td_meet_the_team",
-        })
-
-    seen, out = set(), []
-    for p in people:
-        key = (_first_email(p.get("advisor_email")) or canon_name(p.get("advisor_name") or ""))
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(p)
-    return out
-
-def td_fetch_people(url: str, sleep_s: float):
-    html, final_url = polite_get(url, sleep_s=sleep_s)
-    path = (urlparse(final_url).path or "").lower()
+def td_people_from_page(html: str, final_url: str, soup: BeautifulSoup = None):
+    """People on one fetched TD page; pass soup when the caller already parsed html."""
+    if soup is None:
+        soup = parse_html(html)
+    path = (_uparse(final_url).path or "").lower()
 
     if "meet-the-team" in path or "meet-the-advisors" in path:
-        return td_extract_people_from_meet_page(html), final_url
+        return td_extract_people_from_meet_page(soup), final_url
 
-    p = td_extract_person_from_profile(html, final_url)
+    p = td_extract_person_from_profile(soup, final_url)
     if p:
         return [p], final_url
 
     low = html.lower()
     if ("meet the team" in low) or ("rencontrez l" in low) or ("rencontrez l’équipe" in low) or ("rencontrez l'equipe" in low):
-        roster = td_extract_people_from_meet_page(html)
+        roster = td_extract_people_from_meet_page(soup)
         if roster:
             return roster, final_url
 
     return [], final_url
 
+def td_fetch_people(url: str, sleep_s: float):
+    html, final_url = polite_get(url, sleep_s=sleep_s)
+    return td_people_from_page(html, final_url)
+
+# Discovery functions return plain (branch_seed_url, target_url, link_text, kind)
+# tuples; the UI builds one DataFrame from all seeds at the end.
+CANDIDATE_COLS = ["branch_seed_url", "target_url", "link_text", "kind"]
+
+def _unique_candidates(rows):
+    return _unique_by(rows, lambda r: (r[1], r[3]))
+
 def discover_td_targets(seed_url: str, sleep_s: float):
     """TD directory pages usually have 2 sections: Advisors + Teams."""
     html, final_url = polite_get(seed_url, sleep_s=sleep_s)
-    soup = BeautifulSoup(html, "lxml")
-
-    if td_is_directory_page(soup):
-        advisors = td_extract_links_under_heading(
-            soup, final_url, {"advisors", "advisor", "conseillers", "conseiller"}
-        )
-        teams = td_extract_links_under_heading(
-            soup, final_url, {"teams", "team", "équipes", "equipes", "équipe", "equipe"}
-        )
-
-        rows = []
-        for t, u in advisors:
-            rows.append({"branch_seed_url": seed_url, "target_url": u, "link_text": t, "kind": "td_advisor"})
-        for t, u in teams:
-            rows.append({"branch_seed_url": seed_url, "target_url": u, "link_text": t, "kind": "td_team"})
-
-        df = pd.DataFrame(rows)
-        if not df.empty:
-            return df.drop_duplicates(subset=["target_url", "kind"]).reset_index(drop=True)
+    soup = parse_html(html)
+    headings = td_page_headings(soup)
+
+    if td_is_directory_page(headings):
+        advisors = td_extract_links_under_heading(headings, final_url, TD_ADVISOR_HEADINGS)
+        teams = td_extract_links_under_heading(headings, final_url, TD_TEAM_HEADINGS)
+
+        rows = [(seed_url, u, t, "td_advisor") for t, u in advisors]
+        rows += [(seed_url, u, t, "td_team") for t, u in teams]
+        if rows:
+            return _unique_candidates(rows)
 
     # fallback
-    roots = td_scan_all_one_segment_roots(html, final_url)
-    df = pd.DataFrame([{"branch_seed_url": seed_url, "target_url": u, "link_text": t, "kind": "td_unknown"} for t, u in roots])
-    if df.empty:
-        root = td_root_from_any_td_url(final_url)
-        df = pd.DataFrame([{"branch_seed_url": seed_url, "target_url": root, "link_text": "seed", "kind": "td_unknown"}])
-    return df.drop_duplicates(subset=["target_url", "kind"]).reset_index(drop=True)
+    roots = td_scan_all_one_segment_roots(soup, final_url)
+    rows = [(seed_url, u, t, "td_unknown") for t, u in roots]
+    if not rows:
+        rows = [(seed_url, td_root_from_any_td_url(final_url), "seed", "td_unknown")]
+    return _unique_candidates(rows)
 
 
 # =============================================================================
@@ -621,26 +879,26 @@ DESJARDINS_TEAM_LINK_RE = re.compile(r"/find-us/desjardins-securities-team/[^/?#
 
 def discover_desjardins_targets(seed_url: str, sleep_s: float):
     html, final_url = polite_get(seed_url, sleep_s=sleep_s)
-    links = extract_links(html, final_url)
+    links = collect_links(html, final_url)
 
     candidates = []
-    if DESJARDINS_TEAM_LINK_RE.search(urlparse(final_url).path):
-        candidates.append({"branch_seed_url": seed_url, "target_url": norm_url(final_url), "link_text": "seed", "kind": "desjardins_team"})
+    if DESJARDINS_TEAM_LINK_RE.search(_uparse(final_url).path):
+        candidates.append((seed_url, norm_url(final_url), "seed", "desjardins_team"))
 
     for text, u in links:
+        # substring test first: most anchors on a branch page are not team links at all
+        if "/find-us/desjardins-securities-team/" not in u.lower():
+            continue
         if not is_desjardins_url(u):
             continue
-        if not DESJARDINS_TEAM_LINK_RE.search(urlparse(u).path):
+        if not DESJARDINS_TEAM_LINK_RE.search(_uparse(u).path):
             continue
         t = (text or "").strip()
         if t.lower().startswith("view profile") or t.lower().startswith("voir le profil"):
             continue
-        candidates.append({"branch_seed_url": seed_url, "target_url": norm_url(u), "link_text": t or u, "kind": "desjardins_team"})
+        candidates.append((seed_url, norm_url(u), t or u, "desjardins_team"))
 
-    df = pd.DataFrame(candidates)
-    if df.empty:
-        return pd.DataFrame(columns=["branch_seed_url", "target_url", "link_text", "kind"])
-    return df.drop_duplicates(subset=["target_url", "kind"]).reset_index(drop=True)
+    return _unique_candidates(candidates)
 
 
 # =============================================================================
@@ -648,13 +906,15 @@ def discover_desjardins_targets(seed_url: str, sleep_s: float):
 # =============================================================================
 
 def branch_slug_from_url(url: str) -> str:
-    parts = urlparse(url).path.strip("/").split("/")
+    parts = _uparse(url).path.strip("/").split("/")
     if len(parts) >= 2 and parts[0].lower() == "web":
         return parts[1].lower()
     return ""
 
+# called for every link on a CIBC hub page, and hub links repeat across seeds of one branch
+@lru_cache(maxsize=4096)
 def is_true_team_root(url: str, branch_slug: str) -> bool:
-    path = urlparse(url).path.strip("/")
+    path = _uparse(url).path.strip("/")
     if not path:
         return False
     parts = path.split("/")
@@ -676,14 +936,13 @@ def discover_targets_from_seed(seed_url: str, sleep_s: float):
 
     # CIBC WG: discover team roots from the teams hub page
     html, final_url = polite_get(seed_url, sleep_s=sleep_s)
-    links = extract_links(html, final_url)
+    links = collect_links(html, final_url)
 
     if "our-investment-advisors-and-their-teams" not in final_url.lower():
-        for _, u in links:
-            if "our-investment-advisors-and-their-teams" in (u or "").lower():
-                html, final_url = polite_get(u, sleep_s=sleep_s)
-                links = extract_links(html, final_url)
-                break
+        hub_url = next((u for _, u in links if "our-investment-advisors-and-their-teams" in u.lower()), "")
+        if hub_url:
+            html, final_url = polite_get(hub_url, sleep_s=sleep_s)
+            links = collect_links(html, final_url)
 
     branch_slug = branch_slug_from_url(final_url)
     candidates = []
@@ -691,18 +950,26 @@ def discover_targets_from_seed(seed_url: str, sleep_s: float):
         if not same_domain(u, final_url):
             continue
         if is_true_team_root(u, branch_slug):
-            candidates.append({"branch_seed_url": seed_url, "target_url": u, "link_text": text, "kind": "cibc_team"})
+            candidates.append((seed_url, u, text, "cibc_team"))
+
+    return _unique_candidates(candidates)
+
+# Re-clicking "Discover targets" (e.g. after moving the delay slider) reuses the last
+# result per seed. _sleep_s is left out of the cache key; it only paces real fetches.
+DISCOVER_CACHE_TTL_S = 3600
+
+@st.cache_data(ttl=DISCOVER_CACHE_TTL_S, show_spinner=False)
+def discover_targets_cached(seed_url: str, _sleep_s: float):
+    return discover_targets_from_seed(seed_url, sleep_s=_sleep_s)
+
 
-    df = pd.DataFrame(candidates)
-    if df.empty:
-        return pd.DataFrame(columns=["branch_seed_url", "target_url", "link_text", "kind"])
-    return df.drop_duplicates(subset=["target_url", "kind"]).reset_index(drop=True)
 # =============================================================================
 # Slug helper (internal; NOT exported)
 # =============================================================================
 
+@lru_cache(maxsize=4096)
 def to_team_slug(team_root_url: str) -> str:
-    p = urlparse(team_root_url)
+    p = _uparse(team_root_url)
     host = (p.netloc or "").lower()
     parts = [x for x in p.path.strip("/").split("/") if x]
 
@@ -714,15 +981,15 @@ def to_team_slug(team_root_url: str) -> str:
     if "desjardins.com" in host and parts:
         last = parts[-1].lower().replace(".html", "")
         last = last.replace("_", "-")
-        last = re.sub(r"[^a-z0-9\-]+", "-", last)
-        last = re.sub(r"-{2,}", "-", last).strip("-")
+        last = _SLUG_BAD_RE.sub("-", last)
+        last = _DASH_RUN_RE.sub("-", last).strip("-")
         return last
 
     # CIBC (one-segment team root)
     seg = parts[0] if parts else ""
     seg = seg.replace("_", "-")
-    seg = re.sub(r"[^A-Za-z0-9\-]+", "-", seg)
-    seg = re.sub(r"-{2,}", "-", seg).strip("-")
+    seg = _SLUG_BAD_RE.sub("-", seg)
+    seg = _DASH_RUN_RE.sub("-", seg).strip("-")
     return seg.lower()
 
 
@@ -730,14 +997,14 @@ def to_team_slug(team_root_url: str) -> str:
 # CIBC: fix team name + better role parsing
 # =============================================================================
 
-CIBC_GENERIC_TITLES = {
+CIBC_GENERIC_TITLES = frozenset({
     "accueil", "home", "our team", "notre équipe", "notre equipe",
     "contact", "services", "produits", "products"
-}
+})
 
 def pretty_from_slug(slug: str) -> str:
     s = (slug or "").strip("/").replace("-", " ").replace("_", " ").strip()
-    s = re.sub(r"\s{2,}", " ", s)
+    s = _MULTI_SPACE_RE.sub(" ", s)
     return s.title()
 
 def choose_cibc_team_name(page_title_value: str, slug: str, link_text: str) -> str:
@@ -770,40 +1037,24 @@ def looks_like_name(name: str) -> bool:
     parts = s.split()
     if len(parts) < 2 or len(parts) > 6:
         return False
-    if EMAIL_RE.search(s) or PHONE_RE.search(s):
+    if CONTACT_RE.search(s):
         return False
-    if not re.match(r"^[A-Za-zÀ-ÿ]", s):
+    if not _LEAD_LETTER_RE.match(s):
         return False
     return True
 
 def extract_contact_from_block(block: BeautifulSoup):
-    emails = []
-    for a in block.select('a[href^="mailto:"]'):
-        href = a.get("href", "")
-        e = href.split("mailto:", 1)[-1].split("?", 1)[0].strip()
-        if e and e not in emails:
-            emails.append(e)
-    if not emails:
-        for m in EMAIL_RE.findall(block.get_text(" ", strip=True)):
-            if m not in emails:
-                emails.append(m)
-
-    phone_candidates = []
-    for a in block.select('a[href^="tel:"]'):
-        href = a.get("href", "")
-        p = href.split("tel:", 1)[-1].strip()
-        if p:
-            phone_candidates.append(p)
+    txt, txt_lines = text_and_lines(block)
+
+    emails, phone_candidates = contact_links(block)
+    emails = list(dict.fromkeys(emails)) or list(dict.fromkeys(find_emails(txt)))
 
     if not phone_candidates:
-        txt = block.get_text(" ", strip=True)
-        for m in PHONE_RE.findall(txt):
-            phone_candidates.append(m)
+        phone_candidates = PHONE_RE.findall(txt)
 
     phones = _normalize_phone_list(phone_candidates)
 
     address = ""
-    txt_lines = [x.strip() for x in block.get_text("\n", strip=True).split("\n") if x.strip()]
     for i, line in enumerate(txt_lines):
         if POSTAL_CA_RE.search(line):
             start = max(0, i - 2)
@@ -817,13 +1068,16 @@ def extract_contact_from_block(block: BeautifulSoup):
         "advisor_address": address
     }
 
-def extract_people_from_page(html: str, base_url: str):
-    soup = BeautifulSoup(html, "lxml")
-    people = []
+def extract_people_from_page(soup: BeautifulSoup, base_url: str):
+    # page-level dedupe on (first email or canonical name, phone digits), done as we go
+    people = {}
+    # headings of one card/section climb to the same block: extract its contacts once
+    # (keyed by id: Tag equality and hashing compare whole subtrees)
+    block_contacts = {}
 
     for h in soup.find_all(["h2", "h3", "h4", "h5"]):
         raw = h.get_text(" ", strip=True)
-        name = re.sub(r"\s+", " ", raw or "").strip()
+        name = _WS_RE.sub(" ", raw or "").strip()
         if not looks_like_name(name):
             continue
 
@@ -832,65 +1086,66 @@ def extract_people_from_page(html: str, base_url: str):
             if block.parent is None:
                 break
             block = block.parent
-            if block.select_one('a[href^="mailto:"]') or block.select_one('a[href^="tel:"]'):
+            if has_contact_link(block):
                 break
 
+        contact = block_contacts.get(id(block))
+        if contact is None:
+            contact = block_contacts[id(block)] = extract_contact_from_block(block)
+        clean_name = clean_person_name(name)
+        k = (_first_email(contact.get("advisor_email")) or canon_name(clean_name),
+             _digits_phone(contact.get("advisor_phone") or ""))
+        if k in people:
+            continue
+
+        # only for people kept: lazy sibling walk, stops at the first role
         role = ""
-        for sib in h.find_next_siblings(limit=8):
+        for sib in islice((x for x in h.next_siblings if isinstance(x, Tag)), 8):
             txt = sib.get_text(" ", strip=True)
             if is_likely_role(txt, name):
                 role = txt
                 break
 
-        contact = extract_contact_from_block(block)
-
         profile_url = ""
         a = h.find("a", href=True)
         if a:
             profile_url = norm_url(urljoin(base_url, a.get("href")))
 
-        people.append({
-            "advisor_name": clean_person_name(name),
+        people[k] = {
+            "advisor_name": clean_name,
             "advisor_role": role,
             "advisor_profile_url": profile_url,
             **contact,
             "source": "heuristic_block"
-        })
+        }
 
-    # page-level dedupe
-    seen = set()
-    out = []
-    for p in people:
-        k = (_first_email(p.get("advisor_email")) or canon_name(p.get("advisor_name") or ""), _digits_phone(p.get("advisor_phone") or ""))
-        if k in seen:
-            continue
-        seen.add(k)
-        out.append(p)
-    return out
+    return list(people.values())
 
 
 # =============================================================================
 # CIBC people extraction (card-based around mailto/tel)
 # =============================================================================
 
-def _role_soft(text: str, person_name: str = "") -> bool:
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def is_role_line(text: str, person_name: str = "") -> bool:
+    """Role/title line for a person: 2-120 chars, no email/phone, not the person's own name and
+    not a junk phrase; then either a ROLE_WORDS token, or a generic (non CIBC-title) line of two
+    or more words containing a letter."""
     if not text:
         return False
-    t = re.sub(r"\s+", " ", text).strip(" -|•·")
+    t = _WS_RE.sub(" ", text).strip(" -|•·")
     if len(t) < 2 or len(t) > 120:
         return False
-    if EMAIL_RE.search(t) or PHONE_RE.search(t):
+    if CONTACT_RE.search(t):
         return False
     if person_name and _canon(t) == _canon(person_name):
         return False
     tl = t.lower()
-    if tl in JUNK_PHRASES or tl in CIBC_GENERIC_TITLES:
-        return False
-    if not re.search(r"[A-Za-zÀ-ÿ]", t):
-        return False
-    if len(t.split()) < 2:
+    if tl in JUNK_PHRASES:
         return False
-    return True
+    if not ROLE_WORDS.isdisjoint(_WORD_TOKEN_RE.findall(tl)):
+        return True
+    return tl not in CIBC_GENERIC_TITLES and bool(_ANY_LETTER_RE.search(t)) and len(t.split()) >= 2
 
 def _nearest_contact_card(node):
     cur = node
@@ -900,16 +1155,15 @@ def _nearest_contact_card(node):
         if getattr(cur, "name", None) in ("div", "li", "section", "article"):
             txt = cur.get_text(" ", strip=True)
             if 40 <= len(txt) <= 1400:
-                if cur.select_one('a[href^="mailto:"]') or cur.select_one('a[href^="tel:"]'):
+                if has_contact_link(cur):
                     return cur
         cur = cur.parent
     return node.parent if node else None
 
-def extract_people_from_cibc(html: str, base_url: str):
-    soup = BeautifulSoup(html, "lxml")
+def extract_people_from_cibc(soup: BeautifulSoup, base_url: str):
     people = []
 
-    mailtos = soup.select('a[href^="mailto:"]')
+    mailtos = soup.find_all("a", href=_is_mailto_href)
     if not mailtos:
         return []
 
@@ -922,6 +1176,7 @@ def extract_people_from_cibc(html: str, base_url: str):
         card = _nearest_contact_card(a)
         if card is None:
             continue
+        card_text, lines = text_and_lines(card)
 
         # name: prefer headings/strong
         name = ""
@@ -932,7 +1187,6 @@ def extract_people_from_cibc(html: str, base_url: str):
                 break
 
         if not name:
-            lines = [x.strip() for x in card.get_text("\n", strip=True).split("\n") if x.strip()]
             for line in lines[:16]:
                 nm = clean_person_name(line)
                 if is_valid_person_name(nm):
@@ -942,28 +1196,24 @@ def extract_people_from_cibc(html: str, base_url: str):
             continue
 
         # phones
-        phone_candidates = []
-        for t in card.select('a[href^="tel:"]'):
-            ph = (t.get("href", "").split("tel:", 1)[-1] or "").strip()
-            if ph:
-                phone_candidates.append(ph)
+        phone_candidates = contact_links(card)[1]
         if not phone_candidates:
-            phone_candidates += PHONE_RE.findall(card.get_text(" ", strip=True))
+            phone_candidates = PHONE_RE.findall(card_text)
         phones = _normalize_phone_list(phone_candidates)
 
         # role: lines after name, before contact
         role = ""
-        lines = [x.strip() for x in card.get_text("\n", strip=True).split("\n") if x.strip()]
         idx = -1
+        name_key = _canon(name)
         for i, line in enumerate(lines):
-            if _canon(clean_person_name(line)) == _canon(name):
+            if _canon(clean_person_name(line)) == name_key:
                 idx = i
                 break
 
         for line in lines[idx + 1: idx + 14]:
-            if EMAIL_RE.search(line) or PHONE_RE.search(line):
+            if CONTACT_RE.search(line):
                 break
-            if is_likely_role(line, name) or _role_soft(line, name):
+            if is_role_line(line, name):
                 role = line
                 break
 
@@ -977,35 +1227,66 @@ def extract_people_from_cibc(html: str, base_url: str):
             "source": "cibc_card",
         })
 
-    # De-dupe by email
-    seen, out = set(), []
-    for p in people:
-        k = (p.get("advisor_email") or "").lower().strip()
-        if not k or k in seen:
-            continue
-        seen.add(k)
-        out.append(p)
-    return out
+    # De-dupe by email (cards without one are dropped)
+    people = [p for p in people if (p.get("advisor_email") or "").strip()]
+    return _unique_by(people, lambda p: p["advisor_email"].lower().strip())
 
 
 # =============================================================================
 # Fetch people (routes TD / CIBC / generic)
 # =============================================================================
 
-def fetch_people(url: str, sleep_s: float):
-    if is_td_url(url):
-        return td_fetch_people(url, sleep_s=sleep_s)
-
-    html, final_url = polite_get(url, sleep_s=sleep_s)
+def people_from_page(html: str, final_url: str, soup: BeautifulSoup = None):
+    """People on one fetched non-TD page; pass soup when the caller already parsed html."""
+    if soup is None:
+        soup = parse_html(html)
 
     if is_cibc_wg_url(final_url):
-        people = extract_people_from_cibc(html, final_url)
+        people = extract_people_from_cibc(soup, final_url)
         if people:
             return people, final_url
         # fallback
-        return extract_people_from_page(html, final_url), final_url
+        return extract_people_from_page(soup, final_url), final_url
 
-    return extract_people_from_page(html, final_url), final_url
+    return extract_people_from_page(soup, final_url), final_url
+
+def fetch_people(url: str, sleep_s: float):
+    if is_td_url(url):
+        return td_fetch_people(url, sleep_s=sleep_s)
+
+    html, final_url = polite_get(url, sleep_s=sleep_s)
+    return people_from_page(html, final_url)
+
+def fetch_people_many(urls, sleep_s: float, max_workers: int = 8):
+    """fetch_people for several URLs at once; results in input order, first error re-raised.
+    _polite_wait still spaces requests per host, so only different hosts (and parsing) overlap."""
+    urls = list(urls)
+    if len(urls) <= 1:
+        return [fetch_people(u, sleep_s=sleep_s) for u in urls]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        futs = [pool.submit(fetch_people, u, sleep_s) for u in urls]
+        return [f.result() for f in futs]
+
+_CONTACT_FILL_FIELDS = ("advisor_email", "advisor_phone", "advisor_address", "advisor_profile_url")
+
+def merge_contact_people(people: list, contact_people: list) -> list:
+    """Fold a contact page into the team roster: a known (canonical) name only fills its empty
+    fields, the role only when the contact entry's text reads like one; new names are appended."""
+    by_name = {canon_name(p.get("advisor_name", "")): p for p in people if p.get("advisor_name")}
+    for cp in contact_people:
+        k = canon_name(cp.get("advisor_name", ""))
+        if not k:
+            continue
+        p = by_name.get(k)
+        if p is None:
+            people.append(cp)
+            continue
+        for fld in _CONTACT_FILL_FIELDS:
+            if not p.get(fld) and cp.get(fld):
+                p[fld] = cp.get(fld)
+        if not p.get("advisor_role") and is_role_line(cp.get("advisor_role", ""), cp.get("advisor_name", "")):
+            p["advisor_role"] = cp.get("advisor_role", "")
+    return people
 
 
 # =============================================================================
@@ -1037,50 +1318,53 @@ def post_process_directory(df_out: pd.DataFrame, drop_no_contact=False) -> pd.Da
     if df.empty:
         return pd.DataFrame(columns=BASE_COLS)
 
-    def score_row(r):
-        score = 0
-        for c in ["advisor_email", "advisor_phone", "advisor_address", "advisor_profile_url"]:
-            if str(r.get(c) or "").strip():
-                score += 1
-        role = str(r.get("advisor_role") or "").strip()
-        if is_likely_role(role, str(r.get("advisor_name") or "")) or _role_soft(role, str(r.get("advisor_name") or "")):
-            score += 1
-        return score
-
-    df["_score"] = df.apply(score_row, axis=1)
+    def _text(col):
+        return df[col].fillna("").astype(str)
+
+    # score = number of filled contact fields + 1 for a usable role
+    score = pd.Series(0, index=df.index)
+    for c in ["advisor_email", "advisor_phone", "advisor_address", "advisor_profile_url"]:
+        score += _text(c).str.strip().ne("").astype(int)
+    names = _text("advisor_name")
+    score += pd.Series(
+        [is_role_line(r, n) for r, n in zip(_text("advisor_role").str.strip(), names)],
+        index=df.index, dtype=int,
+    )
+    df["_score"] = score
     df = df.sort_values("_score", ascending=False)
 
-    def person_key(r):
-        prof = (r.get("advisor_profile_url") or "").strip().lower()
-        if prof:
-            return "p:" + prof
-        em = _first_email(r.get("advisor_email") or "")
-        if em:
-            return "e:" + em
-        ph = _digits_phone(r.get("advisor_phone") or "")
-        if ph:
-            return "t:" + ph
-        return "n:" + canon_name(r.get("advisor_name") or "")
-
-    df["person_key"] = df.apply(person_key, axis=1)
-
-    merged = []
-    for _, g in df.groupby("person_key", sort=False):
-        base = g.iloc[0].to_dict()
-
-        team_names = [str(x).strip() for x in g["team_name"].tolist() if str(x).strip()]
-        base["team_name"] = "; ".join(dict.fromkeys(team_names))
-
-        for col in ["advisor_role", "advisor_email", "advisor_phone", "advisor_address", "advisor_profile_url"]:
-            vals = [v for v in g[col].tolist() if pd.notna(v) and str(v).strip()]
-            if col == "advisor_role":
-                nm = base.get("advisor_name", "")
-                vals = [v for v in vals if is_likely_role(str(v), nm) or _role_soft(str(v), nm)]
-            base[col] = vals[0] if vals else (base.get(col) or "")
-
-        merged.append(base)
-
-    out = pd.DataFrame(merged)
+    # person key: profile URL, else first email, else phone digits, else canonical name
+    prof = _text("advisor_profile_url").str.strip().str.lower()
+    em = _text("advisor_email").str.split(";", n=1).str[0].str.strip().str.lower()
+    ph = _text("advisor_phone").str.replace(_NON_DIGITS_RE, "", regex=True).str[:15]
+    key = ("p:" + prof).where(prof.ne(""), ("e:" + em).where(em.ne(""), "t:" + ph))
+    # canonical names only for the rows that have nothing else to key on
+    by_name = prof.eq("") & em.eq("") & ph.eq("")
+    key[by_name] = "n:" + df.loc[by_name, "advisor_name"].map(canon_name)
+    df["person_key"] = key
+
+    # merge rows per person: the best-scored row is the base, team names are joined
+    # (first-seen order), and each contact field takes the first filled value in score order
+    cols = list(df.columns)
+    out = df.drop_duplicates("person_key").set_index("person_key")
+    person_keys = df["person_key"]
+
+    teams = df["team_name"].astype(str).str.strip()
+    team_pairs = pd.DataFrame({"k": person_keys, "t": teams})[teams.ne("")].drop_duplicates()
+    out["team_name"] = team_pairs.groupby("k", sort=False)["t"].agg("; ".join).reindex(out.index, fill_value="")
+
+    base_name = person_keys.map(out["advisor_name"])
+    for col in ["advisor_role", "advisor_email", "advisor_phone", "advisor_address", "advisor_profile_url"]:
+        filled = df[col].notna() & df[col].astype(str).str.strip().ne("")
+        if col == "advisor_role":
+            filled &= pd.Series(
+                [is_role_line(str(v), nm) for v, nm in zip(df[col], base_name)], index=df.index, dtype=bool
+            )
+        first = df[col].where(filled).groupby(person_keys, sort=False).first().reindex(out.index)
+        fallback = out[col].where(out[col].astype(bool), "")
+        out[col] = first.where(first.notna(), fallback)
+
+    out = out.reset_index()[cols]
     out = _ensure_cols(out, BASE_COLS, fill="")
     out = out.drop(columns=["_score", "person_key"], errors="ignore")
 
@@ -1093,6 +1377,17 @@ def post_process_directory(df_out: pd.DataFrame, drop_no_contact=False) -> pd.Da
     return out.reset_index(drop=True)
 
 
+# =============================================================================
+# CSV export (UTF-8 BOM so Excel reads accents)
+# =============================================================================
+
+def build_csv_bytes(df: pd.DataFrame, cols: list) -> bytes:
+    """pandas writes the encoded CSV straight into the byte buffer (no intermediate str)."""
+    bio = BytesIO()
+    df[cols].to_csv(bio, index=False, encoding="utf-8-sig")
+    return bio.getvalue()
+
+
 # =============================================================================
 # Excel export (auto-fit + team banding + sheets per input link)
 # - Exported sheets DO NOT include branch_seed_url nor team_slug
@@ -1100,84 +1395,62 @@ def post_process_directory(df_out: pd.DataFrame, drop_no_contact=False) -> pd.Da
 
 def _safe_sheet_name(name: str) -> str:
     s = str(name or "").strip()
-    s = re.sub(r"[\[\]\:\*\?\/\\]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _SHEET_BAD_RE.sub(" ", s)
+    s = _WS_RE.sub(" ", s).strip()
     return (s or "Sheet")[:31]
 
-def _autofit_columns(ws, max_width: int = 52, min_width: int = 10):
-    for col_idx in range(1, ws.max_column + 1):
-        col_letter = get_column_letter(col_idx)
-        max_len = 0
-        for row_idx in range(1, ws.max_row + 1):
-            v = ws.cell(row=row_idx, column=col_idx).value
-            if v is None:
-                continue
-            max_len = max(max_len, len(str(v)))
-        ws.column_dimensions[col_letter].width = max(min_width, min(max_width, max_len + 2))
-
-def _apply_team_banding(ws, team_col_idx: int, start_row: int, end_row: int):
-    fills = [
-        PatternFill("solid", fgColor="F5F7FF"),
-        PatternFill("solid", fgColor="F7F7F7"),
-        PatternFill("solid", fgColor="F4FFF7"),
-        PatternFill("solid", fgColor="FFF7F4"),
-    ]
-    team_to_fill, fill_idx = {}, 0
-
-    for r in range(start_row, end_row + 1):
-        team_val = ws.cell(row=r, column=team_col_idx).value
-        team_raw = str(team_val or "").strip()
-        team_key = team_raw.split(";")[0].strip().lower() if team_raw else ""
-
-        if team_key not in team_to_fill:
-            team_to_fill[team_key] = fills[fill_idx % len(fills)]
-            fill_idx += 1
-
-        fill = team_to_fill[team_key]
-        for c in range(1, ws.max_column + 1):
-            ws.cell(row=r, column=c).fill = fill
+def _set_column_widths(ws, max_lens: list, max_width: int = 52, min_width: int = 10):
+    """Auto-fit from the longest text per column, measured while the rows were written."""
+    for col_idx, max_len in enumerate(max_lens, start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = max(min_width, min(max_width, max_len + 2))
 
 def build_styled_xlsx(df_full: pd.DataFrame, sheet_group_col: str, out_cols: list, band_by_col: str) -> bytes:
-    wb = Workbook()
-    wb.remove(wb.active)
+    # write-only workbook: rows are streamed into the package as they are appended, so widths,
+    # freeze panes, header height and the table are all set before the first row goes out
+    wb = Workbook(write_only=True)
 
-    sheets = [("All", df_full)]
+    # one projection per sheet; reindex adds any missing output column as "" without touching df_full
+    sheets = [("All", df_full.reindex(columns=out_cols, fill_value=""))]
     if sheet_group_col in df_full.columns:
         for seed, g in df_full.groupby(sheet_group_col, dropna=False):
-            sheets.append((_safe_sheet_name(seed), g.copy()))
-
-    header_fill = PatternFill("solid", fgColor="111827")
-    header_font = Font(bold=True, color="FFFFFF")
-    header_align = Alignment(horizontal="left", vertical="center")
+            sheets.append((_safe_sheet_name(seed), g.reindex(columns=out_cols, fill_value="")))
+
+    # Registered once on the workbook; each cell then takes a single style reference instead of
+    # separate fill/font/alignment lookups.
+    header_style = NamedStyle(name="Directory Header")
+    header_style.fill = PatternFill("solid", fgColor="111827")
+    header_style.font = Font(bold=True, color="FFFFFF")
+    header_style.alignment = Alignment(horizontal="left", vertical="center")
     cell_align = Alignment(horizontal="left", vertical="top", wrap_text=True)
+    body_style = NamedStyle(name="Directory Body", alignment=cell_align)
+    band_styles = [
+        NamedStyle(name=f"Directory Band {i}", alignment=cell_align, fill=PatternFill("solid", fgColor=color))
+        for i, color in enumerate(["F5F7FF", "F7F7F7", "F4FFF7", "FFF7F4"], start=1)
+    ]
+    for style in [header_style, body_style, *band_styles]:
+        wb.add_named_style(style)
+    band_idx = out_cols.index(band_by_col) if band_by_col in out_cols else None
 
     used_names = set()
 
     for sheet_name, sdf in sheets:
         ws = wb.create_sheet(title=_safe_sheet_name(sheet_name))
 
-        for c in out_cols:
-            if c not in sdf.columns:
-                sdf[c] = ""
-        sdf = sdf[out_cols].copy()
-
-        for col_idx, col_name in enumerate(out_cols, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=col_name)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_align
-
-        for r_idx, row in enumerate(sdf.itertuples(index=False), start=2):
-            for c_idx, value in enumerate(row, start=1):
-                cell = ws.cell(row=r_idx, column=c_idx, value="" if value is None else str(value))
-                cell.alignment = cell_align
+        # whole sheet out of pandas in one call, then stringified in place while widths are measured
+        rows, max_lens = sdf.to_numpy(dtype=object).tolist(), [len(c) for c in out_cols]
+        for vals in rows:
+            for i, v in enumerate(vals):
+                s = vals[i] = "" if v is None else str(v)
+                if len(s) > max_lens[i]:
+                    max_lens[i] = len(s)
 
+        _set_column_widths(ws, max_lens)
         ws.freeze_panes = "A2"
         ws.row_dimensions[1].height = 22
 
-        if ws.max_row >= 2:
-            ref = f"A1:{get_column_letter(ws.max_column)}{ws.max_row}"
-            base_name = re.sub(r"[^A-Za-z0-9_]", "", f"Tbl_{ws.title}")[:22] or "Table"
+        if rows:
+            ref = f"A1:{get_column_letter(len(out_cols))}{len(rows) + 1}"
+            base_name = _TABLE_NAME_BAD_RE.sub("", f"Tbl_{ws.title}")[:22] or "Table"
             tname, i = base_name, 2
             while tname in used_names:
                 tname = f"{base_name}{i}"
@@ -1185,6 +1458,9 @@ def build_styled_xlsx(df_full: pd.DataFrame, sheet_group_col: str, out_cols: lis
             used_names.add(tname)
 
             tab = Table(displayName=tname, ref=ref)
+            # write-only sheets cannot read the header back, so columns and filter are set here
+            tab.tableColumns = [TableColumn(id=i, name=str(c)) for i, c in enumerate(out_cols, start=1)]
+            tab.autoFilter = AutoFilter(ref=ref)
             tab.tableStyleInfo = TableStyleInfo(
                 name="TableStyleMedium9",
                 showFirstColumn=False,
@@ -1192,19 +1468,267 @@ def build_styled_xlsx(df_full: pd.DataFrame, sheet_group_col: str, out_cols: lis
                 showRowStripes=False,
                 showColumnStripes=False,
             )
-            ws.add_table(tab)
-
-        _autofit_columns(ws)
-
-        if band_by_col in out_cols and ws.max_row >= 2:
-            team_col_idx = out_cols.index(band_by_col) + 1
-            _apply_team_banding(ws, team_col_idx, start_row=2, end_row=ws.max_row)
+            with warnings.catch_warnings():
+                # "add table columns manually" is always raised in write-only mode; done above
+                warnings.simplefilter("ignore", UserWarning)
+                ws.add_table(tab)
+
+        header = []
+        for col_name in out_cols:
+            cell = WriteOnlyCell(ws, value=col_name)
+            cell.style = header_style.name
+            header.append(cell)
+        ws.append(header)
+
+        # team banding: each new team (first name before ";") takes the next fill. factorize numbers
+        # teams in first-seen order, so the fill per row is known before the write loop starts.
+        row_styles = [body_style.name] * len(rows)
+        if band_idx is not None and rows:
+            team_keys = pd.Series([vals[band_idx] for vals in rows]).str.strip().str.split(";").str[0].str.strip().str.lower()
+            codes, _ = pd.factorize(team_keys)
+            row_styles = [band_styles[c % len(band_styles)].name for c in codes]
+
+        for vals, style_name in zip(rows, row_styles):
+            out = []
+            for s in vals:
+                cell = WriteOnlyCell(ws, value=s)
+                cell.style = style_name
+                out.append(cell)
+            ws.append(out)
 
     bio = BytesIO()
     wb.save(bio)
     return bio.getvalue()
 
 
+# =============================================================================
+# Build: one selected target -> directory rows
+# - Runs on worker threads: no Streamlit calls in here.
+# =============================================================================
+
+BUILD_WORKERS = 8
+PROGRESS_MIN_INTERVAL_S = 0.25
+
+def _directory_row(seed, team_root, team_slug, team_name, team_page, contact_page, p: dict,
+                   source_page_used, default_source=""):
+    """One output row as a tuple in BASE_COLS order."""
+    return (
+        seed, team_root, team_slug, team_name, team_page, contact_page,
+        p.get("advisor_name", ""),
+        p.get("advisor_role", ""),
+        p.get("advisor_email", ""),
+        p.get("advisor_phone", ""),
+        p.get("advisor_address", ""),
+        p.get("advisor_profile_url", ""),
+        p.get("source", default_source),
+        source_page_used,
+    )
+
+def build_target_rows(t: dict, sleep_s: float):
+    """Crawl one target. Returns (rows, new_tasks): rows are BASE_COLS tuples, new_tasks are
+    TD teams found via advisor profiles."""
+    target_url = t.get("target_url", "")
+    kind = (t.get("kind") or "").lower()
+    seed = t.get("branch_seed_url", "")
+    link_text = t.get("link_text", "") or ""
+    rows, new_tasks = [], []
+
+    # ---------------- TD ----------------
+    if is_td_url(target_url):
+        root_html, root_final = polite_get(target_url, sleep_s=sleep_s)
+        root_soup = parse_html(root_html)
+
+        part_of = None
+        if kind == "td_unknown" or kind == "td_unk" or kind == "td" or not kind.startswith("td_"):
+            part_of = td_find_part_of_team(root_soup, root_final)
+            kind = "td_advisor" if part_of[0] else "td_team"
+
+        slug = to_team_slug(root_final)
+        page_nm = page_title(root_soup) or slug
+
+        if kind == "td_advisor":
+            # the profile is the root page itself: reuse the response and its soup
+            people, src = td_people_from_page(root_html, root_final, soup=root_soup)
+            _, team_aff_name, team_aff_root = part_of or td_find_part_of_team(root_soup, root_final)
+
+            # hand the team back so the caller can enqueue it if not already queued
+            if team_aff_root:
+                new_tasks.append({
+                    "branch_seed_url": seed,
+                    "target_url": team_aff_root,
+                    "kind": "td_team",
+                    "link_text": team_aff_name or team_aff_root,
+                })
+
+            team_name = team_aff_name or page_nm
+            team_root = team_aff_root or root_final
+
+            team_slug = to_team_slug(team_root)
+            rows.extend(
+                _directory_row(seed, team_root, team_slug, team_name, team_root, "", p, src)
+                for p in people
+            )
+
+        else:
+            meet_url = td_guess_meet_the_team_url(root_final, sleep_s=sleep_s) or root_final
+            people = []
+            if meet_url != root_final:
+                people, src = td_fetch_people(meet_url, sleep_s=sleep_s)
+            if not people:
+                # the root is its own roster fallback: reuse the response and its soup
+                people, src = td_people_from_page(root_html, root_final, soup=root_soup)
+
+            rows.extend(
+                _directory_row(seed, root_final, slug, page_nm, meet_url, "", p, src)
+                for p in people
+            )
+
+        return rows, new_tasks
+
+    # ---------------- Non-TD ----------------
+    html_root, root_final = polite_get(target_url, sleep_s=sleep_s)
+    soup_root = parse_html(html_root)
+    slug = to_team_slug(root_final)
+    team_name = page_title(soup_root) or slug
+
+    # CIBC: fix team name (avoid "Accueil") using the discovery link_text
+    if is_cibc_wg_url(root_final):
+        team_name = choose_cibc_team_name(team_name, slug, link_text)
+
+    links = extract_links(soup_root, root_final)
+    team_page = find_best_link(links, root_final, TEAM_PAGE_TEXT_PAT)
+    contact_page = find_best_link(links, root_final, CONTACT_PAGE_TEXT_PAT)
+
+    # Desjardins: team page contains roster/contact blocks
+    if is_desjardins_url(root_final):
+        team_page = root_final
+        contact_page = ""
+
+    # CIBC: common “web/<slug>/our-team” fallback. The guesses usually miss (the root
+    # page would have linked them), so probe with HEAD; a hit is fetched below anyway.
+    if is_cibc_wg_url(root_final):
+        if not team_page:
+            team_page = polite_head(f"https://woodgundyadvisors.cibc.com/web/{slug}/our-team", sleep_s=sleep_s)
+        if not contact_page:
+            contact_page = polite_head(f"https://woodgundyadvisors.cibc.com/web/{slug}/contact", sleep_s=sleep_s)
+
+    people, source_page_used = [], ""
+
+    # team and contact pages are independent: fetch and parse them together. A page that is
+    # the root itself (Desjardins) reuses the root response and its soup.
+    urls = list(dict.fromkeys(u for u in (team_page, contact_page) if u and u != root_final))
+    fetched = dict(zip(urls, fetch_people_many(urls, sleep_s=sleep_s)))
+    if root_final in (team_page, contact_page):
+        fetched[root_final] = people_from_page(html_root, root_final, soup=soup_root)
+
+    if team_page:
+        people, source_page_used = fetched[team_page]
+
+    if contact_page:
+        contact_people, contact_src = fetched[contact_page]
+        people = merge_contact_people(people, contact_people)
+
+    if not people:
+        people = extract_people_from_page(soup_root, root_final)
+        source_page_used = root_final
+
+    default_source = "" if people else "no_people_found"
+    page_used = source_page_used or team_page or root_final
+    rows.extend(
+        _directory_row(seed, root_final, slug, team_name, team_page, contact_page, p, page_used, default_source)
+        for p in (people or [{}])
+    )
+
+    return rows, new_tasks
+
+def _crawl_plan(tasks, results, max_targets: int):
+    """Replay the sequential crawl (FIFO queue, revealed TD teams appended behind their parent's
+    siblings) over the results known so far. Returns [(key, task)] in crawl order, capped at
+    max_targets; expansion stops at the first task whose result is still pending, so the plan
+    only ever grows at the end."""
+    queue = list(tasks)
+    queued = {(t.get("target_url", ""), t.get("kind", "")) for t in queue}
+    plan, seen = [], set()
+    expanding = True
+    i = 0
+    while i < len(queue) and len(plan) < max_targets:
+        t = queue[i]
+        i += 1
+        key = (t.get("target_url", ""), (t.get("kind") or "").lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        plan.append((key, t))
+        if not expanding:
+            continue
+        res = results.get(key)
+        if res is None:
+            expanding = False
+            continue
+        if isinstance(res, Exception):
+            continue
+        for nt in res[1]:
+            qk = (nt["target_url"], nt["kind"])
+            if qk not in queued:
+                queued.add(qk)
+                queue.append(nt)
+    return plan
+
+def crawl_targets(tasks, sleep_s: float, max_targets: int, on_progress=None):
+    """build_target_rows over tasks plus the TD teams they reveal, on a thread pool.
+    Plan entries are submitted as workers free up (at most BUILD_WORKERS in flight), and revealed
+    teams join the plan as soon as their parent finishes (no per-wave barrier);
+    rows and errors come back in the order a sequential crawl would produce them.
+    Politeness is enforced per host inside polite_get. on_progress(done, total_est) is throttled
+    to PROGRESS_MIN_INTERVAL_S (each Streamlit repaint is a websocket round-trip), plus one call
+    whenever the pool drains."""
+    results, running, submitted = {}, {}, set()
+    done, total_est = 0, max(1, len(tasks))
+    last_paint = 0.0
+
+    # No context manager: leaving a with-block waits for every submitted target. A Stop/rerun
+    # raises out of on_progress (Streamlit), and pending targets must not keep hitting hosts.
+    pool = ThreadPoolExecutor(max_workers=BUILD_WORKERS)
+    try:
+        while True:
+            plan = _crawl_plan(tasks, results, max_targets)
+            # at most BUILD_WORKERS in flight: the rest of the plan waits here, not in the pool
+            for key, t in plan:
+                if len(running) >= BUILD_WORKERS:
+                    break
+                if key not in submitted:
+                    submitted.add(key)
+                    running[pool.submit(build_target_rows, t, sleep_s)] = key
+            total_est = max(total_est, len(plan))
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                key = running.pop(fut)
+                try:
+                    results[key] = fut.result()
+                except Exception as e:
+                    results[key] = e
+                done += 1
+            now = time.monotonic()
+            if on_progress and (not running or now - last_paint >= PROGRESS_MIN_INTERVAL_S):
+                on_progress(done, total_est)
+                last_paint = now
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+    rows, errs = [], []
+    for key, t in plan:
+        res = results[key]
+        if isinstance(res, Exception):
+            errs.append({"target_url": t.get("target_url", ""), "error": str(res)})
+            continue
+        rows.extend(res[0])
+    return rows, errs
+
+
 # =============================================================================
 # Streamlit UI
 # =============================================================================
@@ -1290,6 +1814,7 @@ with left:
 if clear_clicked:
     for k in ["df_candidates", "edited_candidates", "df_clean", "errs_build"]:
         st.session_state.pop(k, None)
+    discover_targets_cached.clear()
     st.rerun()
 
 if discover_clicked:
@@ -1297,21 +1822,15 @@ if discover_clicked:
     if not seeds:
         st.warning("Paste at least one seed URL.")
     else:
-        dfs, errors = [], []
+        rows, errors = [], []
         with st.spinner("Discovering targets..."):
             for s in seeds:
                 try:
-                    dfs.append(discover_targets_from_seed(s, sleep_s=sleep_s))
+                    rows.extend(discover_targets_cached(s, sleep_s))
                 except Exception as e:
                     errors.append({"seed": s, "error": str(e)})
 
-        df_candidates = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame(
-            columns=["branch_seed_url", "target_url", "link_text", "kind"]
-        )
-        if "kind" not in df_candidates.columns:
-            df_candidates["kind"] = "unknown"
-
-        df_candidates = df_candidates.drop_duplicates(subset=["target_url", "kind"]).reset_index(drop=True)
+        df_candidates = pd.DataFrame.from_records(_unique_candidates(rows), columns=CANDIDATE_COLS)
         df_candidates["include"] = True
 
         st.session_state["df_candidates"] = df_candidates
@@ -1355,18 +1874,14 @@ else:
     edited = st.session_state["edited_candidates"].copy()
     chosen = edited[edited["include"] == True].head(int(max_targets)).copy()
 
-    # Order: TD advisors -> TD teams -> others
-    def _ord(kind):
-        k = (kind or "").lower()
-        if k == "td_advisor":
-            return 0
-        if k == "td_team":
-            return 1
-        if k.startswith("td_"):
-            return 2
-        return 3
-
-    chosen["_ord"] = chosen["kind"].apply(_ord)
+    # Order: TD advisors -> TD teams -> other TD -> others
+    kinds = chosen["kind"].fillna("").astype(str).str.lower()
+    chosen["_ord"] = (
+        pd.Series(3, index=chosen.index)
+        .mask(kinds.str.startswith("td_"), 2)
+        .mask(kinds.eq("td_team"), 1)
+        .mask(kinds.eq("td_advisor"), 0)
+    )
     chosen = chosen.sort_values(["_ord", "branch_seed_url", "target_url"]).drop(columns=["_ord"], errors="ignore")
 
     m1, m2, m3 = st.columns(3)
@@ -1377,195 +1892,15 @@ else:
     build_clicked = st.button("Build directory", type="primary")
 
     if build_clicked:
-        rows, errs = [], []
         prog = st.progress(0)
 
-        # ---- TD queue expansion: if advisor profile reveals a team not in the list, crawl it too
-        tasks = chosen.to_dict("records")
-        queued = {(t.get("target_url", ""), t.get("kind", "")) for t in tasks}
-        processed = set()
-
-        i = 0
-        total_est = max(1, len(tasks))
-
         with st.spinner("Building directory..."):
-            while i < len(tasks) and len(processed) < int(max_targets):
-                t = tasks[i]
-                i += 1
-
-                target_url = t.get("target_url", "")
-                kind = (t.get("kind") or "").lower()
-                seed = t.get("branch_seed_url", "")
-                link_text = t.get("link_text", "") or ""
-
-                key = (target_url, kind)
-                if key in processed:
-                    continue
-                processed.add(key)
-
-                try:
-                    # ---------------- TD ----------------
-                    if is_td_url(target_url):
-                        root_html, root_final = polite_get(target_url, sleep_s=sleep_s)
-
-                        if kind == "td_unknown" or kind == "td_unk" or kind == "td" or not kind.startswith("td_"):
-                            inferred = td_detect_single_root_kind(root_html)
-                            kind = "td_advisor" if inferred == "advisor" else "td_team"
-
-                        slug = to_team_slug(root_final)
-                        page_nm = page_title(root_html) or slug
-
-                        if kind == "td_advisor":
-                            people, src = td_fetch_people(root_final, sleep_s=sleep_s)
-                            team_aff_name, team_aff_root = td_extract_part_of_team(root_html, root_final)
-
-                            # enqueue the team if discovered and not already queued
-                            if team_aff_root:
-                                qk = (team_aff_root, "td_team")
-                                if qk not in queued:
-                                    queued.add(qk)
-                                    tasks.append({
-                                        "branch_seed_url": seed,
-                                        "target_url": team_aff_root,
-                                        "kind": "td_team",
-                                        "link_text": team_aff_name or team_aff_root,
-                                    })
-                                    total_est = max(total_est, len(tasks))
-
-                            team_name = team_aff_name or page_nm
-                            team_root = team_aff_root or root_final
-
-                            for p in people:
-                                rows.append({
-                                    "branch_seed_url": seed,
-                                    "team_root_url": team_root,
-                                    "team_slug": to_team_slug(team_root),
-                                    "team_name": team_name,
-                                    "team_page_url": team_root,
-                                    "contact_page_url": "",
-                                    "advisor_name": p.get("advisor_name", ""),
-                                    "advisor_role": p.get("advisor_role", ""),
-                                    "advisor_email": p.get("advisor_email", ""),
-                                    "advisor_phone": p.get("advisor_phone", ""),
-                                    "advisor_address": p.get("advisor_address", ""),
-                                    "advisor_profile_url": p.get("advisor_profile_url", ""),
-                                    "source": p.get("source", ""),
-                                    "source_page_used": src,
-                                })
-
-                        else:
-                            meet_url = td_guess_meet_the_team_url(root_final, sleep_s=sleep_s) or root_final
-                            people, src = td_fetch_people(meet_url, sleep_s=sleep_s)
-                            if not people:
-                                people, src = td_fetch_people(root_final, sleep_s=sleep_s)
-
-                            for p in people:
-                                rows.append({
-                                    "branch_seed_url": seed,
-                                    "team_root_url": root_final,
-                                    "team_slug": slug,
-                                    "team_name": page_nm,
-                                    "team_page_url": meet_url,
-                                    "contact_page_url": "",
-                                    "advisor_name": p.get("advisor_name", ""),
-                                    "advisor_role": p.get("advisor_role", ""),
-                                    "advisor_email": p.get("advisor_email", ""),
-                                    "advisor_phone": p.get("advisor_phone", ""),
-                                    "advisor_address": p.get("advisor_address", ""),
-                                    "advisor_profile_url": p.get("advisor_profile_url", ""),
-                                    "source": p.get("source", ""),
-                                    "source_page_used": src,
-                                })
-
-                        prog.progress(min(1.0, len(processed) / max(1, total_est)))
-                        continue
-
-                    # ---------------- Non-TD ----------------
-                    html_root, root_final = polite_get(target_url, sleep_s=sleep_s)
-                    slug = to_team_slug(root_final)
-                    team_name = page_title(html_root) or slug
-
-                    # CIBC: fix team name (avoid "Accueil") using the discovery link_text
-                    if is_cibc_wg_url(root_final):
-                        team_name = choose_cibc_team_name(team_name, slug, link_text)
-
-                    links = extract_links(html_root, root_final)
-                    team_page = find_best_link(links, root_final, TEAM_PAGE_TEXT_PAT)
-                    contact_page = find_best_link(links, root_final, CONTACT_PAGE_TEXT_PAT)
-
-                    # Desjardins: team page contains roster/contact blocks
-                    if is_desjardins_url(root_final):
-                        team_page = root_final
-                        contact_page = ""
-
-                    # CIBC: common “web/<slug>/our-team” fallback
-                    if is_cibc_wg_url(root_final):
-                        web_team_guess = f"https://woodgundyadvisors.cibc.com/web/{slug}/our-team"
-                        web_contact_guess = f"https://woodgundyadvisors.cibc.com/web/{slug}/contact"
-                        if not team_page:
-                            try:
-                                _, u = polite_get(web_team_guess, sleep_s=sleep_s)
-                                team_page = u
-                            except Exception:
-                                pass
-                        if not contact_page:
-                            try:
-                                _, u = polite_get(web_contact_guess, sleep_s=sleep_s)
-                                contact_page = u
-                            except Exception:
-                                pass
-
-                    people, source_page_used = [], ""
-
-                    if team_page:
-                        people, source_page_used = fetch_people(team_page, sleep_s=sleep_s)
-
-                    if contact_page:
-                        contact_people, contact_src = fetch_people(contact_page, sleep_s=sleep_s)
-                        by_name = {canon_name(p.get("advisor_name", "")): p for p in people if p.get("advisor_name")}
-                        for cp in contact_people:
-                            k = canon_name(cp.get("advisor_name", ""))
-                            if not k:
-                                continue
-                            if k in by_name:
-                                for fld in ["advisor_email", "advisor_phone", "advisor_address", "advisor_role", "advisor_profile_url"]:
-                                    if fld == "advisor_role":
-                                        if (not by_name[k].get(fld)) and (is_likely_role(cp.get(fld, ""), cp.get("advisor_name", "")) or _role_soft(cp.get(fld, ""), cp.get("advisor_name", ""))):
-                                            by_name[k][fld] = cp.get(fld, "")
-                                    else:
-                                        if not by_name[k].get(fld) and cp.get(fld):
-                                            by_name[k][fld] = cp.get(fld)
-                            else:
-                                people.append(cp)
-
-                    if not people:
-                        people = extract_people_from_page(html_root, root_final)
-                        source_page_used = root_final
-
-                    for p in (people or [{}]):
-                        rows.append({
-                            "branch_seed_url": seed,
-                            "team_root_url": root_final,
-                            "team_slug": slug,
-                            "team_name": team_name,
-                            "team_page_url": team_page,
-                            "contact_page_url": contact_page,
-                            "advisor_name": p.get("advisor_name", ""),
-                            "advisor_role": p.get("advisor_role", ""),
-                            "advisor_email": p.get("advisor_email", ""),
-                            "advisor_phone": p.get("advisor_phone", ""),
-                            "advisor_address": p.get("advisor_address", ""),
-                            "advisor_profile_url": p.get("advisor_profile_url", ""),
-                            "source": p.get("source", "no_people_found" if not people else p.get("source", "")),
-                            "source_page_used": source_page_used or team_page or root_final,
-                        })
-
-                except Exception as e:
-                    errs.append({"target_url": target_url, "error": str(e)})
-
-                prog.progress(min(1.0, len(processed) / max(1, total_est)))
+            rows, errs = crawl_targets(
+                chosen.to_dict("records"), sleep_s, int(max_targets),
+                on_progress=lambda done, total: prog.progress(min(1.0, done / max(1, total))),
+            )
 
-        df_out = pd.DataFrame(rows)
+        df_out = pd.DataFrame.from_records(rows, columns=BASE_COLS)
         df_clean = post_process_directory(df_out, drop_no_contact=drop_no_contact)
 
         st.session_state["df_clean"] = df_clean
@@ -1603,7 +1938,7 @@ if "df_clean" in st.session_state:
     st.dataframe(df_export, use_container_width=True, height=420)
 
     # CSV (UTF-8 BOM for Excel accents)
-    csv_bytes = df_export.to_csv(index=False).encode("utf-8-sig")
+    csv_bytes = build_csv_bytes(df_export, OUT_COLS)
     st.download_button(
         "Download CSV (UTF-8)",
         data=csv_bytes,
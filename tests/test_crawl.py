@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+import app
+
+
+def _task(url, kind="td_team"):
+    return {"branch_seed_url": "seed", "target_url": url, "kind": kind, "link_text": url}
+
+
+# advisor profiles reveal teams; some are already queued, one fails
+REVEALS = {
+    "a1": [_task("t1"), _task("t2")],
+    "a2": [_task("t1"), _task("t3")],
+    "t2": [_task("t4")],
+}
+FAILS = {"a3"}
+
+
+def fake_build(t, sleep_s):
+    url = t["target_url"]
+    # finish out of order so the pool's completion order differs from the crawl order
+    time.sleep(0.001 * (hash(url) % 5))
+    if url in FAILS:
+        raise RuntimeError(f"boom {url}")
+    return [(url, "row")], [dict(nt) for nt in REVEALS.get(url, [])]
+
+
+def sequential_crawl(tasks, max_targets):
+    """The pre-pool build loop: FIFO queue, dedupe on (url, kind), revealed teams appended."""
+    queue = list(tasks)
+    queued = {(t.get("target_url", ""), t.get("kind", "")) for t in queue}
+    processed, rows, errs = set(), [], []
+    i = 0
+    while i < len(queue) and len(processed) < max_targets:
+        t = queue[i]
+        i += 1
+        key = (t.get("target_url", ""), (t.get("kind") or "").lower())
+        if key in processed:
+            continue
+        processed.add(key)
+        try:
+            r, new_tasks = fake_build(t, 0.0)
+        except Exception as e:
+            errs.append({"target_url": t.get("target_url", ""), "error": str(e)})
+            continue
+        rows.extend(r)
+        for nt in new_tasks:
+            qk = (nt["target_url"], nt["kind"])
+            if qk not in queued:
+                queued.add(qk)
+                queue.append(nt)
+    return rows, errs
+
+
+TASKS = [
+    _task("a1", "td_advisor"),
+    _task("a2", "td_advisor"),
+    _task("a3", "td_advisor"),
+    _task("a1", "TD_ADVISOR"),
+    _task("t1"),
+    _task("x1", "cibc"),
+]
+
+
+@pytest.mark.parametrize("max_targets", [1, 3, 5, 7, 900])
+def test_crawl_targets_matches_sequential_crawl(monkeypatch, max_targets):
+    monkeypatch.setattr(app, "build_target_rows", fake_build)
+    got = app.crawl_targets(TASKS, sleep_s=0.0, max_targets=max_targets)
+    assert got == sequential_crawl(TASKS, max_targets)
+
+
+def test_crawl_plan_stops_expanding_at_pending_result():
+    tasks = [_task("a1", "td_advisor"), _task("a2", "td_advisor")]
+    plan = app._crawl_plan(tasks, {}, 10)
+    assert [k for k, _ in plan] == [("a1", "td_advisor"), ("a2", "td_advisor")]
+
+    results = {("a1", "td_advisor"): fake_build(tasks[0], 0.0)}
+    plan = app._crawl_plan(tasks, results, 10)
+    assert [k[0] for k, _ in plan] == ["a1", "a2", "t1", "t2"]
+    assert len(app._crawl_plan(tasks, results, 3)) == 3
+
+
+def test_crawl_targets_bounds_in_flight_and_cancels_on_error(monkeypatch):
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0, "started": 0}
+
+    def slow_build(t, sleep_s):
+        with lock:
+            state["started"] += 1
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.02)
+        with lock:
+            state["in_flight"] -= 1
+        return [], []
+
+    def stop(done, total):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(app, "build_target_rows", slow_build)
+    monkeypatch.setattr(app, "PROGRESS_MIN_INTERVAL_S", 0.0)
+    tasks = [_task(f"u{i}") for i in range(100)]
+    with pytest.raises(KeyboardInterrupt):
+        app.crawl_targets(tasks, sleep_s=0.0, max_targets=100, on_progress=stop)
+    time.sleep(0.1)
+
+    assert state["peak"] <= app.BUILD_WORKERS
+    assert state["started"] < 2 * app.BUILD_WORKERS
+
+
+def test_polite_get_spaces_starts_per_host_behind_busy_slots(monkeypatch):
+    """Requests that queued behind both host slots still go out sleep_s apart."""
+    sleep_s = 0.1
+    durations = [0.5, 0.45] + [0.05] * 4  # the second response finishes right behind the first
+    lock = threading.Lock()
+    starts = []
+
+    class FakeResponse:
+        encoding = "utf-8"
+        apparent_encoding = "utf-8"
+        text = "<html></html>"
+
+        def __init__(self, url):
+            self.url = url
+
+        def raise_for_status(self):
+            pass
+
+    def slow_get(url, timeout=None, allow_redirects=True):
+        with lock:
+            starts.append(time.monotonic())
+            d = durations[len(starts) - 1]
+        time.sleep(d)
+        return FakeResponse(url)
+
+    monkeypatch.setattr(app.SESSION, "get", slow_get)
+    urls = [f"https://spacing.example.test/p{i}" for i in range(len(durations))]
+    threads = []
+    for u in urls:
+        th = threading.Thread(target=app.polite_get, args=(u,), kwargs={"sleep_s": sleep_s})
+        th.start()
+        threads.append(th)
+        time.sleep(0.01)  # keep arrival order stable
+    for th in threads:
+        th.join()
+
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == len(urls)
+    assert min(gaps) >= sleep_s - 0.01
@@ -0,0 +1,41 @@
+from io import BytesIO
+
+import pandas as pd
+from openpyxl import load_workbook
+
+import app
+
+OUT_COLS = ["team_name", "advisor_name", "advisor_email"]
+
+
+def _directory():
+    return pd.DataFrame(
+        [
+            ("https://a.example/branch-one", "Alpha Team", "Jane Doe", "jane@a.example"),
+            ("https://a.example/branch-one", "alpha team; Beta", "John Roe", "john@a.example"),
+            ("https://a.example/branch-one", "Beta", "Mary Major", ""),
+            ("https://b.example/[two]", "Gamma", "Bob Smith", "bob@b.example"),
+        ],
+        columns=["branch_seed_url", "team_name", "advisor_name", "advisor_email"],
+    )
+
+
+def test_build_styled_xlsx_two_branches():
+    wb = load_workbook(BytesIO(app.build_styled_xlsx(_directory(), "branch_seed_url", OUT_COLS, "team_name")))
+
+    assert wb.sheetnames == ["All", "https a.example branch-one", "https b.example two"]
+
+    all_ws = wb["All"]
+    assert [c.value for c in all_ws[1]] == OUT_COLS
+    assert [c.value for c in all_ws[3]] == ["alpha team; Beta", "John Roe", "john@a.example"]
+    assert all_ws.tables["Tbl_All"].ref == "A1:C5"
+    assert dict(wb["https a.example branch-one"].tables.items()) == {"Tbl_httpsaexamplebranc": "A1:C4"}
+    assert dict(wb["https b.example two"].tables.items()) == {"Tbl_httpsbexampletwo": "A1:C2"}
+    for ws in wb.worksheets:
+        assert ws.freeze_panes == "A2"
+
+    # bands follow the first team name: rows 2-3 share Alpha, Beta and Gamma each take the next fill
+    fills = [all_ws.cell(row=r, column=1).fill.fgColor.rgb for r in range(2, 6)]
+    assert fills[0] == fills[1]
+    assert len({fills[1], fills[2], fills[3]}) == 3
+    assert all_ws.cell(row=1, column=1).font.bold
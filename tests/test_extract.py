@@ -0,0 +1,32 @@
+from bs4 import BeautifulSoup
+
+import app
+
+PAGE = """<section>
+<div class="card"><h3>Jane Doe</h3><p>Investment Advisor</p>
+<a href="mailto:jane@example.com">jane@example.com</a> <a href="tel:5145551212">514-555-1212</a></div>
+<div class="card"><h3>Jane Doe</h3><p>Senior Wealth Advisor</p>
+<a href="mailto:jane@example.com">jane@example.com</a> <a href="tel:5145551212">514-555-1212</a></div>
+<div class="card"><h3><a href="/bob">Bob Smith</a></h3><p>Wealth Advisor</p>
+<a href="mailto:bob@example.com">bob@example.com</a></div>
+</section>"""
+
+
+def test_extract_people_from_page_skips_duplicates_before_role_walk(monkeypatch):
+    seen = []
+    real = app.is_likely_role
+
+    def spy(text, person_name=""):
+        seen.append(person_name)
+        return real(text, person_name)
+
+    monkeypatch.setattr(app, "is_likely_role", spy)
+    people = app.extract_people_from_page(BeautifulSoup(PAGE, app._PARSER), "https://example.com/team/")
+
+    assert [(p["advisor_name"], p["advisor_role"]) for p in people] == [
+        ("Jane Doe", "Investment Advisor"),
+        ("Bob Smith", "Wealth Advisor"),
+    ]
+    assert people[1]["advisor_profile_url"] == "https://example.com/bob"
+    # the repeated Jane card is dropped on its key, without walking its siblings for a role
+    assert seen.count("Jane Doe") == 1
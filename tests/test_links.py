@@ -0,0 +1,30 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import app
+
+BASE = "https://example.com/branch/"
+
+PAGES = [
+    # plain anchors, relative/absolute hrefs, fragments and queries dropped by norm_url
+    '<ul><li><a href="team">Our <b>Team</b></a></li><li><a href="/contact?x=1#top"> Contact us </a></li>'
+    '<li><a href="https://other.org/a">Elsewhere</a></li><li><a href="">empty</a><a name="x">no href</a></li></ul>',
+    # script/style/template text inside anchors is not anchor text
+    '<a href="team"><style>.x{color:red}</style>Meet the team<script>var t = "Contact";</script></a>'
+    '<a href="c"><template>Hidden</template>Contact</a><script>document.write("<a href=x>y</a>")</script>',
+    # comments, entities, nested inline markup and whitespace runs
+    '<nav><a href="/fr/equipe"><!-- nav --><span>Rencontrez</span>\n  <em>l&rsquo;&eacute;quipe</em></a>'
+    '<a href="mailto:jane@example.com">jane@example.com</a><a href="tel:5145551212"><img alt="p">Call</a></nav>',
+    # unclosed anchors and stray end tags
+    '<p><a href="one">One<p>Two</a><a href="two">Three</p></a><a href="three">Four',
+]
+
+
+@pytest.mark.parametrize("html", PAGES)
+def test_collect_links_matches_extract_links(html):
+    assert app.collect_links(html, BASE) == app.extract_links(BeautifulSoup(html, app._PARSER), BASE)
+
+
+def test_collect_links_ignores_script_text():
+    html = '<a href="team"><script>var t = 1;</script>Our team</a>'
+    assert app.collect_links(html, BASE) == [("Our team", "https://example.com/branch/team")]
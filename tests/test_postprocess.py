@@ -0,0 +1,60 @@
+import pandas as pd
+
+import app
+
+
+def _frame():
+    rows = [
+        # Jane: role equal to her own name is masked, whitespace-only email is blank
+        dict(team_name="Alpha", advisor_name="Jane Doe", advisor_role="Jane Doe",
+             advisor_email="   ", advisor_phone="514-555-1212"),
+        dict(team_name="Beta", advisor_name="Jane Doe", advisor_role="Investment Advisor",
+             advisor_email="", advisor_phone="(514) 555-1212", advisor_address="1 Main St"),
+        # Bob: profile URL keys match case-insensitively
+        dict(team_name="Alpha", advisor_name="Bob Smith", advisor_role="Wealth Advisor",
+             advisor_email="BOB@x.com; bob2@x.com", advisor_profile_url="https://x.com/Bob"),
+        dict(team_name="Gamma", advisor_name="Bob Smith", advisor_role="",
+             advisor_email="bob@x.com", advisor_phone="416-555-0000", advisor_address="2 King St",
+             advisor_profile_url="HTTPS://X.COM/BOB"),
+        # Carol: no contact at all, so she is keyed on her name
+        dict(team_name="Alpha", advisor_name="Carol White", advisor_role="Senior Wealth Advisor"),
+        dict(team_name="Delta", advisor_name="Carol White", advisor_role=""),
+    ]
+    return pd.DataFrame(rows).reindex(columns=app.BASE_COLS).fillna("")
+
+
+def test_post_process_directory_merges_people():
+    out = app.post_process_directory(_frame())
+
+    assert list(out.columns) == app.BASE_COLS
+    assert out["advisor_name"].tolist() == ["Bob Smith", "Jane Doe", "Carol White"]
+    bob, jane, carol = (r for _, r in out.iterrows())
+
+    # best-scored row is the base; teams joined in score order; blanks filled from other rows
+    assert bob["team_name"] == "Gamma; Alpha"
+    assert bob["advisor_role"] == "Wealth Advisor"
+    assert bob["advisor_email"] == "bob@x.com"
+    assert bob["advisor_phone"] == "416-555-0000"
+    assert bob["advisor_profile_url"] == "HTTPS://X.COM/BOB"
+
+    # phone digits key; masked role and whitespace-only email never win
+    assert jane["team_name"] == "Beta; Alpha"
+    assert jane["advisor_role"] == "Investment Advisor"
+    assert jane["advisor_email"] == ""
+    assert jane["advisor_phone"] == "(514) 555-1212"
+    assert jane["advisor_address"] == "1 Main St"
+
+    assert carol["team_name"] == "Alpha; Delta"
+    assert carol["advisor_role"] == "Senior Wealth Advisor"
+
+
+def test_post_process_directory_drop_no_contact():
+    out = app.post_process_directory(_frame(), drop_no_contact=True)
+    assert out["advisor_name"].tolist() == ["Bob Smith", "Jane Doe"]
+    assert out.index.tolist() == [0, 1]
+
+
+def test_post_process_directory_empty_after_name_filter():
+    out = app.post_process_directory(pd.DataFrame([dict(advisor_name="")]))
+    assert out.empty
+    assert list(out.columns) == app.BASE_COLS
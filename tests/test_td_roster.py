@@ -0,0 +1,55 @@
+from bs4 import BeautifulSoup
+
+import app
+
+ROSTER = """<div><h2>Meet the team</h2>
+<div><p>Photo</p><h3>Jane Doe</h3><p>Investment Advisor</p><p><span>514</span><span>555-1212</span></p></div>
+<div><p>Photo</p><h3>Bob Smith</h3><p>Associate Investment Advisor</p>
+<a href="tel:4165550000">416-555-0000</a><a href="mailto:bob@td.com">bob@td.com</a></div>
+<div><p>LinkedIn</p></div>
+<div><h3>Carol White</h3><p>Client Associate</p><p>Tel: 905</p><p>555-0101 ext 2</p></div>
+<p>Additional TD Specialists</p><div><h3>Dan Brown</h3><p>416-555-9999</p></div>
+</div>"""
+
+
+def test_meet_page_splits_entries_on_phone_split_across_strings():
+    people = app.td_extract_people_from_meet_page(BeautifulSoup(ROSTER, app._PARSER))
+
+    assert [p["advisor_name"] for p in people] == ["Jane Doe", "Bob Smith", "Carol White"]
+    jane, bob, carol = people
+
+    # "514" + "555-1212" only forms a phone across the two strings: it still closes Jane's
+    # entry at Bob's name, while the phone value is taken per string, so Jane gets none
+    assert jane["advisor_role"] == "Investment Advisor"
+    assert jane["advisor_phone"] == ""
+    assert bob["advisor_role"] == "Associate Investment Advisor"
+    assert bob["advisor_phone"] == "416-555-0000"
+    assert bob["advisor_email"] == "bob@td.com"
+    assert carol["advisor_role"] == "Client Associate"
+    assert carol["advisor_phone"] == ""
+
+
+def test_meet_url_cache_expires_and_is_capped(monkeypatch):
+    probes = []
+
+    def head(url, sleep_s=0.75, timeout=10):
+        probes.append(url)
+        return url
+
+    monkeypatch.setattr(app, "polite_head", head)
+    monkeypatch.setattr(app, "PAGE_CACHE_MAX", 2)
+    app._TD_MEET_URLS.clear()
+
+    root = "https://advisors.td.com/cache-test"
+    assert app.td_guess_meet_the_team_url(root, 0.0) == root + "/meet-the-team.htm"
+    assert app.td_guess_meet_the_team_url(root, 0.0) == root + "/meet-the-team.htm"
+    assert len(probes) == 1
+
+    monkeypatch.setattr(app, "PAGE_CACHE_TTL_S", -1)
+    app.td_guess_meet_the_team_url(root, 0.0)
+    assert len(probes) == 2
+
+    for i in range(3):
+        app._meet_url_store(f"{root}/{i}/", "x")
+    assert len(app._TD_MEET_URLS) == 2
+    app._TD_MEET_URLS.clear()